@@ -11,26 +11,30 @@ import (
 
 	"github.com/milindmadhukar/cloudget/pkg/downloader"
 	"github.com/milindmadhukar/cloudget/pkg/interfaces"
+	"github.com/milindmadhukar/cloudget/pkg/utils"
 	"github.com/sirupsen/logrus"
 )
 
 var (
-	url            = flag.String("url", "", "URL to download")
-	urls           = flag.String("urls", "", "Comma-separated list of URLs to download")
-	urlFile        = flag.String("url-file", "", "File containing URLs to download (one per line)")
-	outputDir      = flag.String("output-dir", ".", "Output directory for downloads")
-	outputPath     = flag.String("output", "", "Specific output file path (for single URL)")
-	filename       = flag.String("filename", "", "Custom filename (for single URL)")
-	maxConnections = flag.Int("max-connections", 8, "Maximum concurrent connections per download")
-	chunkSize      = flag.String("chunk-size", "2MB", "Chunk size for downloads (e.g., 1MB, 512KB)")
-	timeout        = flag.Duration("timeout", 300*time.Second, "Download timeout")
-	resume         = flag.Bool("resume", true, "Enable download resume")
-	verifyHash     = flag.String("verify-hash", "", "Expected hash for verification")
-	hashAlgorithm  = flag.String("hash-algorithm", "sha256", "Hash algorithm (md5, sha1, sha256, sha512)")
-	verbose        = flag.Bool("verbose", false, "Enable verbose logging")
-	quiet          = flag.Bool("quiet", false, "Suppress all output except errors")
-	showProgress   = flag.Bool("progress", true, "Show download progress")
-	showHelp       = flag.Bool("help", false, "Show help message")
+	url             = flag.String("url", "", "URL to download")
+	urls            = flag.String("urls", "", "Comma-separated list of URLs to download")
+	urlFile         = flag.String("url-file", "", "File containing URLs to download (one per line)")
+	outputDir       = flag.String("output-dir", ".", "Output directory for downloads")
+	outputPath      = flag.String("output", "", "Specific output file path (for single URL)")
+	filename        = flag.String("filename", "", "Custom filename (for single URL)")
+	maxConnections  = flag.Int("max-connections", 8, "Maximum concurrent connections per download")
+	parallel        = flag.Int("parallel", 1, "Number of URLs to download at the same time")
+	autoConnections = flag.Bool("auto-connections", false, "Tune connections per download to measured throughput (up to 32)")
+	chunkSize       = flag.String("chunk-size", "auto", "Chunk size for downloads (e.g., 1MB, 512KB), or auto to size by file")
+	directIO        = flag.Bool("direct-io", false, "Write chunked downloads with O_DIRECT, bypassing the page cache (Linux)")
+	timeout         = flag.Duration("timeout", 300*time.Second, "Retry a request after this long without receiving data")
+	resume          = flag.Bool("resume", true, "Enable download resume")
+	verifyHash      = flag.String("verify-hash", "", "Expected hash for verification")
+	hashAlgorithm   = flag.String("hash-algorithm", "sha256", "Hash algorithm (md5, sha1, sha256, sha512)")
+	verbose         = flag.Bool("verbose", false, "Enable verbose logging")
+	quiet           = flag.Bool("quiet", false, "Suppress all output except errors")
+	showProgress    = flag.Bool("progress", true, "Show download progress")
+	showHelp        = flag.Bool("help", false, "Show help message")
 )
 
 func main() {
@@ -69,13 +73,15 @@ func main() {
 
 	// Create download manager
 	manager := downloader.NewManager(&downloader.ManagerOptions{
-		MaxConnections: *maxConnections,
-		ChunkSize:      chunkSizeBytes,
-		Timeout:        *timeout,
-		OutputDir:      *outputDir,
-		Resume:         *resume,
-		VerifyHash:     *verifyHash != "",
-		HashAlgorithm:  *hashAlgorithm,
+		MaxConnections:      *maxConnections,
+		ChunkSize:           chunkSizeBytes,
+		Timeout:             *timeout,
+		OutputDir:           *outputDir,
+		Resume:              *resume,
+		VerifyHash:          *verifyHash != "",
+		HashAlgorithm:       *hashAlgorithm,
+		AdaptiveConnections: *autoConnections,
+		DirectIO:            *directIO,
 	})
 
 	manager.SetLogger(logger)
@@ -86,21 +92,22 @@ func main() {
 	var totalBytes int64
 	var successCount, failCount int
 
+	reqs := make([]*interfaces.DownloadRequest, len(urlList))
 	for i, downloadURL := range urlList {
-		logger.Infof("Downloading %d/%d: %s", i+1, len(urlList), downloadURL)
-
-		// Create download request
-		req := &interfaces.DownloadRequest{
+		reqs[i] = &interfaces.DownloadRequest{
 			URL:            downloadURL,
 			OutputPath:     *outputPath,
 			CustomFilename: *filename,
 			VerifyHash:     *verifyHash,
 		}
+	}
 
-		// Perform download
-		result, err := manager.Download(ctx, req)
-		if err != nil {
-			logger.Errorf("Download failed: %v", err)
+	// Perform downloads
+	results, errs := manager.DownloadMany(ctx, reqs, *parallel)
+
+	for i, result := range results {
+		if errs[i] != nil {
+			logger.Errorf("Download failed: %s: %v", urlList[i], errs[i])
 			failCount++
 			continue
 		}
@@ -108,7 +115,7 @@ func main() {
 		// Show results
 		logger.Infof("Download completed successfully!")
 		logger.Infof("File: %s", result.FilePath)
-		logger.Infof("Size: %s", formatBytes(result.Size))
+		logger.Infof("Size: %s", utils.FormatBytes(result.Size))
 		logger.Infof("Time: %.1f seconds", result.Duration.Seconds())
 		logger.Infof("Speed: %.1f MB/s", result.Speed)
 
@@ -129,7 +136,7 @@ func main() {
 	logger.Infof("Total URLs: %d", len(urlList))
 	logger.Infof("Successful: %d", successCount)
 	logger.Infof("Failed: %d", failCount)
-	logger.Infof("Total size: %s", formatBytes(totalBytes))
+	logger.Infof("Total size: %s", utils.FormatBytes(totalBytes))
 	logger.Infof("Total time: %.1f seconds", overallDuration.Seconds())
 	logger.Infof("Overall speed: %.1f MB/s", overallSpeed)
 
@@ -190,6 +197,11 @@ func readURLsFromFile(filename string) ([]string, error) {
 func parseSize(sizeStr string) (int64, error) {
 	sizeStr = strings.ToUpper(strings.TrimSpace(sizeStr))
 
+	// Zero leaves the chunk size to the downloader
+	if sizeStr == "AUTO" {
+		return 0, nil
+	}
+
 	// Extract number and unit
 	var num string
 	var unit string
@@ -228,19 +240,6 @@ func parseSize(sizeStr string) (int64, error) {
 	return int64(size * float64(multiplier)), nil
 }
 
-func formatBytes(bytes int64) string {
-	const unit = 1024
-	if bytes < unit {
-		return fmt.Sprintf("%d B", bytes)
-	}
-	div, exp := int64(unit), 0
-	for n := bytes / unit; n >= unit; n /= unit {
-		div *= unit
-		exp++
-	}
-	return fmt.Sprintf("%.1f %cB", float64(bytes)/float64(div), "KMGTPE"[exp])
-}
-
 func printHelp() {
 	fmt.Printf(`CloudGet CLI - Download files from Dropbox, Google Drive, and WeTransfer
 
@@ -256,8 +255,8 @@ Examples:
   # Download multiple files
   %s -urls "https://dropbox.com/s/abc/file1.zip,https://drive.google.com/file/d/xyz/view"
   
-  # Download from file list
-  %s -url-file urls.txt -output-dir ./downloads
+  # Download from file list, four files at a time
+  %s -url-file urls.txt -output-dir ./downloads -parallel 4
   
   # Download with custom settings
   %s -url "https://we.tl/t-abc123" -chunk-size 5MB -max-connections 16
@@ -2,6 +2,7 @@ package main
 
 import (
 	"context"
+	"flag"
 	"testing"
 	"time"
 
@@ -132,3 +133,46 @@ func TestDownloadManagerInterface(t *testing.T) {
 		t.Logf("Cancel returned error (expected): %v", err)
 	}
 }
+
+func TestParseSize(t *testing.T) {
+	tests := []struct {
+		input       string
+		expected    int64
+		expectError bool
+	}{
+		// Zero leaves the chunk size to the downloader
+		{"auto", 0, false},
+		{"AUTO", 0, false},
+		{" Auto ", 0, false},
+		{"2MB", 2 * 1024 * 1024, false},
+		{"512KB", 512 * 1024, false},
+		{"1.5MB", 1536 * 1024, false},
+		{"4096", 4096, false},
+		{"MB", 0, true},
+		{"2XB", 0, true},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.input, func(t *testing.T) {
+			result, err := parseSize(tt.input)
+			if tt.expectError {
+				if err == nil {
+					t.Errorf("parseSize(%q) should fail", tt.input)
+				}
+				return
+			}
+			if err != nil {
+				t.Fatalf("parseSize(%q) failed: %v", tt.input, err)
+			}
+			if result != tt.expected {
+				t.Errorf("parseSize(%q) = %d, want %d", tt.input, result, tt.expected)
+			}
+		})
+	}
+
+	// The -chunk-size default leaves the choice to the downloader
+	result, err := parseSize(flag.Lookup("chunk-size").DefValue)
+	if err != nil || result != 0 {
+		t.Errorf("parseSize of the -chunk-size default = %d, %v; want 0, nil", result, err)
+	}
+}
@@ -816,3 +816,67 @@ func TestManager_Cancel(t *testing.T) {
 		t.Errorf("Cancel should not return error for unimplemented functionality, got: %v", err)
 	}
 }
+
+func TestManager_DownloadMany(t *testing.T) {
+	tmpDir := t.TempDir()
+
+	server := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		content := "test file content"
+		w.Header().Set("Content-Length", fmt.Sprintf("%d", len(content)))
+		w.Header().Set("Content-Type", "text/plain")
+		io.WriteString(w, content)
+	}))
+	defer server.Close()
+
+	manager := NewManager(&ManagerOptions{
+		MaxConnections: 8,
+		ChunkSize:      2 * 1024 * 1024,
+		Timeout:        300 * time.Second,
+		OutputDir:      tmpDir,
+		Resume:         false,
+		HashAlgorithm:  "sha256",
+	})
+
+	service := &mockService{
+		name: "test-service",
+		supportedFn: func(url string) bool {
+			return strings.Contains(url, "test.com")
+		},
+		getInfoFn: func(ctx context.Context, url string) (*interfaces.FileInfo, error) {
+			return &interfaces.FileInfo{
+				Filename: "test-file.txt",
+				Size:     17, // len("test file content")
+				URL:      url,
+			}, nil
+		},
+		prepareDownloadFn: func(ctx context.Context, url string) (string, error) {
+			return server.URL, nil
+		},
+	}
+	manager.RegisterService(service)
+
+	reqs := []*interfaces.DownloadRequest{
+		{URL: "https://test.com/file/1", CustomFilename: "one.txt"},
+		{URL: "https://unknown.example/file/2", CustomFilename: "two.txt"},
+		{URL: "https://test.com/file/3", CustomFilename: "three.txt"},
+	}
+
+	results, errs := manager.DownloadMany(context.Background(), reqs, 2)
+	if len(results) != len(reqs) || len(errs) != len(reqs) {
+		t.Fatalf("Expected %d results and errors, got %d and %d", len(reqs), len(results), len(errs))
+	}
+
+	if errs[1] == nil || results[1] != nil {
+		t.Error("Expected unsupported URL to fail without a result")
+	}
+
+	for _, i := range []int{0, 2} {
+		if errs[i] != nil {
+			t.Fatalf("Download %d failed: %v", i, errs[i])
+		}
+		expectedPath := filepath.Join(tmpDir, reqs[i].CustomFilename)
+		if results[i].FilePath != expectedPath {
+			t.Errorf("Expected path %q, got %q", expectedPath, results[i].FilePath)
+		}
+	}
+}
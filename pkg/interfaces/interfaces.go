@@ -125,6 +125,11 @@ type ResumeData struct {
 	ChunkSize    int64     `json:"chunk_size"`
 	LastModified time.Time `json:"last_modified"`
 	Hash         string    `json:"hash,omitempty"`
+	// Validator identifies the version of the remote file: its ETag, or its
+	// Last-Modified date when it has none
+	Validator string `json:"validator,omitempty"`
+	// CompletedChunks lists the indices of chunks already written to FilePath
+	CompletedChunks []int `json:"completed_chunks,omitempty"`
 }
 
 // HTTPClient interface for making HTTP requests
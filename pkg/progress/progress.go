@@ -7,6 +7,7 @@ import (
 	"sync"
 	"time"
 
+	"github.com/milindmadhukar/cloudget/pkg/utils"
 	"github.com/schollz/progressbar/v3"
 	"github.com/sirupsen/logrus"
 )
@@ -129,7 +130,7 @@ func (t *Tracker) StartDownload(id, filename string, totalBytes int64) *Download
 	t.downloads[id] = progress
 
 	if t.showProgress {
-		t.logger.Infof("Started downloading: %s (%s)", filename, formatBytes(totalBytes))
+		t.logger.Infof("Started downloading: %s (%s)", filename, utils.FormatBytes(totalBytes))
 	}
 
 	return progress
@@ -255,9 +256,9 @@ func (t *Tracker) CompleteDownload(id string) {
 
 	t.logger.Infof("Completed: %s (%s in %v, avg speed: %s/s)",
 		progress.Filename,
-		formatBytes(progress.TotalBytes),
+		utils.FormatBytes(progress.TotalBytes),
 		duration.Round(time.Second),
-		formatBytes(int64(avgSpeed)))
+		utils.FormatBytes(int64(avgSpeed)))
 }
 
 func (t *Tracker) FailDownload(id string, err error) {
@@ -340,7 +341,7 @@ func (t *Tracker) PrintSummary() {
 	fmt.Printf("Total Downloads: %d\n", len(t.downloads))
 	fmt.Printf("Completed: %d, Failed: %d, Running: %d\n", completed, failed, running)
 	fmt.Printf("Total Size: %s, Downloaded: %s\n",
-		formatBytes(totalBytes), formatBytes(downloadedBytes))
+		utils.FormatBytes(totalBytes), utils.FormatBytes(downloadedBytes))
 
 	if failed > 0 {
 		fmt.Println("\nFailed Downloads:")
@@ -402,19 +403,6 @@ func (pr *ProgressReader) Read(p []byte) (int, error) {
 	return n, err
 }
 
-func formatBytes(bytes int64) string {
-	const unit = 1024
-	if bytes < unit {
-		return fmt.Sprintf("%d B", bytes)
-	}
-	div, exp := int64(unit), 0
-	for n := bytes / unit; n >= unit; n /= unit {
-		div *= unit
-		exp++
-	}
-	return fmt.Sprintf("%.1f %cB", float64(bytes)/float64(div), "KMGTPE"[exp])
-}
-
 // CreateProgressCallback creates a callback function for HTTP client progress reporting
 func (t *Tracker) CreateProgressCallback(downloadID string) func(downloaded, total int64) {
 	return func(downloaded, total int64) {
@@ -8,9 +8,13 @@ import (
 	"strings"
 
 	"github.com/milindmadhukar/cloudget/pkg/interfaces"
+	"github.com/milindmadhukar/cloudget/pkg/utils"
 	"github.com/sirupsen/logrus"
 )
 
+// validURLPattern matches the shared-link formats Dropbox serves files from
+var validURLPattern = regexp.MustCompile(`dropbox\.com/(?:s|scl/fi)/[a-zA-Z0-9]+/.*`)
+
 type Service struct {
 	logger *logrus.Logger
 }
@@ -27,7 +31,7 @@ func New(logger *logrus.Logger) *Service {
 }
 
 func (s *Service) IsSupported(urlStr string) bool {
-	return strings.Contains(urlStr, "dropbox.com")
+	return utils.HostMatches(urlStr, "dropbox.com")
 }
 
 func (s *Service) GetServiceName() string {
@@ -40,19 +44,58 @@ func (s *Service) ConvertURL(urlStr string) (string, error) {
 	}
 
 	// Handle different Dropbox URL formats
-	if strings.Contains(urlStr, "/s/") || strings.Contains(urlStr, "/scl/fi/") {
-		if strings.Contains(urlStr, "dl=0") {
-			return strings.Replace(urlStr, "dl=0", "dl=1", 1), nil
-		} else if strings.Contains(urlStr, "?") {
-			return urlStr + "&dl=1", nil
-		} else {
-			return urlStr + "?dl=1", nil
-		}
+	if isSharedLink(urlStr) {
+		return withDirectDownload(urlStr), nil
 	}
 
 	return "", fmt.Errorf("unsupported Dropbox URL format")
 }
 
+// isSharedLink reports whether urlStr contains one of the shared-link
+// markers "/s/" or "/scl/fi/". Both start with "/s", so a single scan for
+// that prefix checks for either.
+func isSharedLink(urlStr string) bool {
+	for i := 0; ; {
+		j := strings.Index(urlStr[i:], "/s")
+		if j < 0 {
+			return false
+		}
+		i += j
+
+		rest := urlStr[i:]
+		if strings.HasPrefix(rest, "/s/") || strings.HasPrefix(rest, "/scl/fi/") {
+			return true
+		}
+		i += len("/s")
+	}
+}
+
+// withDirectDownload turns a shared link into a direct download link by
+// switching its dl=0 parameter to dl=1, or adding dl=1 if there is none.
+// Only the query is scanned, once.
+func withDirectDownload(urlStr string) string {
+	q := strings.IndexByte(urlStr, '?')
+	if q < 0 {
+		return urlStr + "?dl=1"
+	}
+
+	for i := q; ; {
+		j := strings.Index(urlStr[i+1:], "dl=0")
+		if j < 0 {
+			break
+		}
+		i += 1 + j
+
+		end := i + len("dl=0")
+		if (urlStr[i-1] == '?' || urlStr[i-1] == '&') &&
+			(end == len(urlStr) || urlStr[end] == '&' || urlStr[end] == '#') {
+			return urlStr[:end-1] + "1" + urlStr[end:]
+		}
+	}
+
+	return urlStr + "&dl=1"
+}
+
 func (s *Service) GetFileInfo(ctx context.Context, urlStr string) (*interfaces.FileInfo, error) {
 	// This would typically make an HTTP HEAD request to get file metadata
 	// For now, we'll return basic info - this should be implemented with actual HTTP calls
@@ -92,24 +135,24 @@ func (s *Service) extractFilename(urlStr string) string {
 		decodedPath = parsedURL.Path
 	}
 
-	// Handle Dropbox URL structure
+	// Handle Dropbox URL structure, walking path segments in place
+	// instead of splitting the path
 	if strings.Contains(decodedPath, "/s/") {
 		// Format: /s/hash/filename
-		parts := strings.Split(decodedPath, "/")
-		if len(parts) >= 4 {
-			filename := parts[len(parts)-1]
-			if filename != "" {
-				return filename
-			}
+		if strings.Count(decodedPath, "/") >= 3 {
+			return decodedPath[strings.LastIndexByte(decodedPath, '/')+1:]
 		}
 	} else if strings.Contains(decodedPath, "/scl/fi/") {
-		// New format: extract filename from path
-		parts := strings.Split(decodedPath, "/")
-		for i := len(parts) - 1; i >= 0; i-- {
-			part := parts[i]
-			if part != "" && strings.Contains(part, ".") {
+		// New format: the filename is the last segment that has an extension
+		for rest := decodedPath; rest != ""; {
+			i := strings.LastIndexByte(rest, '/')
+			if part := rest[i+1:]; strings.Contains(part, ".") {
 				return part
 			}
+			if i < 0 {
+				break
+			}
+			rest = rest[:i]
 		}
 	}
 
@@ -132,17 +175,8 @@ func (s *Service) ValidateURL(urlStr string) error {
 	}
 
 	// Check for known Dropbox URL patterns
-	validPatterns := []string{
-		`dropbox\.com/s/[a-zA-Z0-9]+/.*`,
-		`dropbox\.com/scl/fi/[a-zA-Z0-9]+/.*`,
-	}
-
-	urlString := strings.ToLower(urlStr)
-	for _, pattern := range validPatterns {
-		matched, err := regexp.MatchString(pattern, urlString)
-		if err == nil && matched {
-			return nil
-		}
+	if validURLPattern.MatchString(strings.ToLower(urlStr)) {
+		return nil
 	}
 
 	return fmt.Errorf("unsupported Dropbox URL format")
@@ -117,6 +117,16 @@ func TestService_ConvertURL(t *testing.T) {
 			url:      "https://dropbox.com/scl/fi/abc123/file.pdf?dl=0",
 			expected: "https://dropbox.com/scl/fi/abc123/file.pdf?dl=1",
 		},
+		{
+			name:     "dl=0 after other query params",
+			url:      "https://dropbox.com/scl/fi/abc123/file.pdf?rlkey=xyz&dl=0",
+			expected: "https://dropbox.com/scl/fi/abc123/file.pdf?rlkey=xyz&dl=1",
+		},
+		{
+			name:     "dl=0 only inside another parameter",
+			url:      "https://dropbox.com/s/abc123/file.pdf?xdl=0",
+			expected: "https://dropbox.com/s/abc123/file.pdf?xdl=0&dl=1",
+		},
 		{
 			name:        "non-dropbox URL",
 			url:         "https://google.com/file.pdf",
@@ -5,7 +5,6 @@ import (
 	"fmt"
 	"net/http"
 	"net/url"
-	"regexp"
 	"strings"
 
 	"github.com/milindmadhukar/cloudget/pkg/interfaces"
@@ -13,21 +12,37 @@ import (
 	"github.com/sirupsen/logrus"
 )
 
+// hosts are the domains Google Drive links are served from
+var hosts = []string{"drive.google.com", "docs.google.com"}
+
 type Service struct {
 	httpClient *utils.HTTPClient
-	logger     *logrus.Logger
+	// redirectClient shares httpClient's connections but leaves redirects to us
+	redirectClient *http.Client
+	logger         *logrus.Logger
 }
 
 func New() *Service {
+	return NewWithClient(nil)
+}
+
+// NewWithClient creates a service that makes its requests through
+// httpClient, so connections are shared with the caller's downloads.
+// A nil httpClient gets a client of its own.
+func NewWithClient(httpClient *utils.HTTPClient) *Service {
+	if httpClient == nil {
+		httpClient = utils.NewHTTPClient()
+	}
+
 	return &Service{
-		httpClient: utils.NewHTTPClient(),
-		logger:     logrus.New(),
+		httpClient:     httpClient,
+		redirectClient: httpClient.NoRedirectClient(),
+		logger:         logrus.New(),
 	}
 }
 
 func (s *Service) IsSupported(rawURL string) bool {
-	return strings.Contains(rawURL, "drive.google.com") ||
-		strings.Contains(rawURL, "docs.google.com")
+	return utils.HostMatches(rawURL, hosts...)
 }
 
 func (s *Service) GetServiceName() string {
@@ -49,31 +64,49 @@ func (s *Service) ConvertURL(rawURL string) (string, error) {
 }
 
 func (s *Service) extractFileID(rawURL string) (string, error) {
-	// Pattern 1: /file/d/{file_id}/
-	re1 := regexp.MustCompile(`/file/d/([a-zA-Z0-9_-]+)`)
-	if matches := re1.FindStringSubmatch(rawURL); len(matches) > 1 {
-		return matches[1], nil
+	// Forms are tried in order: /file/d/{file_id}, then id={file_id} in the
+	// query (which covers /open?id=), then /d/{file_id}
+	if id := idAfter(rawURL, "/file/d/", ""); id != "" {
+		return id, nil
 	}
-
-	// Pattern 2: id={file_id}
-	re2 := regexp.MustCompile(`[?&]id=([a-zA-Z0-9_-]+)`)
-	if matches := re2.FindStringSubmatch(rawURL); len(matches) > 1 {
-		return matches[1], nil
+	if id := idAfter(rawURL, "id=", "?&"); id != "" {
+		return id, nil
 	}
-
-	// Pattern 3: /open?id={file_id}
-	re3 := regexp.MustCompile(`/open\?id=([a-zA-Z0-9_-]+)`)
-	if matches := re3.FindStringSubmatch(rawURL); len(matches) > 1 {
-		return matches[1], nil
+	if id := idAfter(rawURL, "/d/", ""); id != "" {
+		return id, nil
 	}
 
-	// Pattern 4: /d/{file_id}
-	re4 := regexp.MustCompile(`/d/([a-zA-Z0-9_-]+)`)
-	if matches := re4.FindStringSubmatch(rawURL); len(matches) > 1 {
-		return matches[1], nil
+	return "", fmt.Errorf("no file ID found in URL")
+}
+
+// idAfter returns the first non-empty run of file ID characters following
+// marker in s. If preceders is set, marker only counts when the character
+// before it is one of them.
+func idAfter(s, marker, preceders string) string {
+	for offset := 0; ; {
+		i := strings.Index(s[offset:], marker)
+		if i < 0 {
+			return ""
+		}
+		start := offset + i
+		offset = start + len(marker)
+
+		if preceders != "" && (start == 0 || strings.IndexByte(preceders, s[start-1]) < 0) {
+			continue
+		}
+
+		end := offset
+		for end < len(s) && isFileIDChar(s[end]) {
+			end++
+		}
+		if end > offset {
+			return s[offset:end]
+		}
 	}
+}
 
-	return "", fmt.Errorf("no file ID found in URL")
+func isFileIDChar(c byte) bool {
+	return 'a' <= c && c <= 'z' || 'A' <= c && c <= 'Z' || '0' <= c && c <= '9' || c == '_' || c == '-'
 }
 
 func (s *Service) GetFileInfo(ctx context.Context, rawURL string) (*interfaces.FileInfo, error) {
@@ -136,13 +169,6 @@ func (s *Service) PrepareDownload(ctx context.Context, rawURL string) (string, e
 }
 
 func (s *Service) handleVirusScanRedirect(downloadURL string) (string, error) {
-	client := &http.Client{
-		CheckRedirect: func(req *http.Request, via []*http.Request) error {
-			// Don't follow redirects automatically, we want to handle them
-			return http.ErrUseLastResponse
-		},
-	}
-
 	req, err := http.NewRequest("GET", downloadURL, nil)
 	if err != nil {
 		return "", err
@@ -153,7 +179,8 @@ func (s *Service) handleVirusScanRedirect(downloadURL string) (string, error) {
 		req.Header.Set(key, value)
 	}
 
-	resp, err := client.Do(req)
+	// Don't follow redirects automatically, we want to handle them
+	resp, err := s.redirectClient.Do(req)
 	if err != nil {
 		return "", err
 	}
@@ -182,9 +209,14 @@ func (s *Service) handleVirusScanRedirect(downloadURL string) (string, error) {
 	return downloadURL, nil
 }
 
+// defaultHeaders are sent with every request; built once and never modified
+var defaultHeaders = map[string]string{
+	"Accept-Encoding": "identity",
+	"User-Agent":      "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+}
+
+// getDefaultHeaders returns the shared default headers. Callers must not
+// modify the returned map.
 func (s *Service) getDefaultHeaders() map[string]string {
-	return map[string]string{
-		"Accept-Encoding": "identity",
-		"User-Agent":      "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-	}
+	return defaultHeaders
 }
@@ -7,6 +7,7 @@ import (
 	"testing"
 	"time"
 
+	"github.com/milindmadhukar/cloudget/pkg/utils"
 	"github.com/stretchr/testify/assert"
 	"github.com/stretchr/testify/require"
 )
@@ -18,6 +19,15 @@ func TestNew(t *testing.T) {
 	assert.NotNil(t, service.logger)
 }
 
+func TestNewWithClient(t *testing.T) {
+	httpClient := utils.NewHTTPClient()
+	service := NewWithClient(httpClient)
+	assert.Same(t, httpClient, service.httpClient)
+
+	// A nil client falls back to one of the service's own
+	assert.NotNil(t, NewWithClient(nil).httpClient)
+}
+
 func TestService_GetServiceName(t *testing.T) {
 	service := New()
 	assert.Equal(t, "Google Drive", service.GetServiceName())
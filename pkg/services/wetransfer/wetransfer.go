@@ -14,6 +14,16 @@ import (
 	"github.com/sirupsen/logrus"
 )
 
+var (
+	// shortURLPattern matches we.tl short links
+	shortURLPattern = regexp.MustCompile(`(?i:we\.tl)/([a-zA-Z0-9]+)`)
+	// downloadURLPattern matches full wetransfer.com download links
+	downloadURLPattern = regexp.MustCompile(`(?i:wetransfer\.com)/downloads/([a-zA-Z0-9]+)`)
+)
+
+// hosts are the domains WeTransfer links are served from
+var hosts = []string{"wetransfer.com", "we.tl"}
+
 type Service struct {
 	httpClient *utils.HTTPClient
 	logger     *logrus.Logger
@@ -39,15 +49,25 @@ type DownloadResponse struct {
 }
 
 func New() *Service {
+	return NewWithClient(nil)
+}
+
+// NewWithClient creates a service that makes its requests through
+// httpClient, so connections are shared with the caller's downloads.
+// A nil httpClient gets a client of its own.
+func NewWithClient(httpClient *utils.HTTPClient) *Service {
+	if httpClient == nil {
+		httpClient = utils.NewHTTPClient()
+	}
+
 	return &Service{
-		httpClient: utils.NewHTTPClient(),
+		httpClient: httpClient,
 		logger:     logrus.New(),
 	}
 }
 
 func (s *Service) IsSupported(rawURL string) bool {
-	return strings.Contains(rawURL, "wetransfer.com") ||
-		strings.Contains(rawURL, "we.tl")
+	return utils.HostMatches(rawURL, hosts...)
 }
 
 func (s *Service) GetServiceName() string {
@@ -65,15 +85,11 @@ func (s *Service) ConvertURL(rawURL string) (string, error) {
 }
 
 func (s *Service) extractTransferID(rawURL string) (string, error) {
-	// Pattern for we.tl short URLs
-	re1 := regexp.MustCompile(`we\.tl/([a-zA-Z0-9]+)`)
-	if matches := re1.FindStringSubmatch(rawURL); len(matches) > 1 {
+	if matches := shortURLPattern.FindStringSubmatch(rawURL); len(matches) > 1 {
 		return matches[1], nil
 	}
 
-	// Pattern for full wetransfer.com URLs
-	re2 := regexp.MustCompile(`wetransfer\.com/downloads/([a-zA-Z0-9]+)`)
-	if matches := re2.FindStringSubmatch(rawURL); len(matches) > 1 {
+	if matches := downloadURLPattern.FindStringSubmatch(rawURL); len(matches) > 1 {
 		return matches[1], nil
 	}
 
@@ -146,15 +162,10 @@ func (s *Service) getWeTransferDownloadInfo(ctx context.Context, rawURL string)
 	}
 
 	// Add headers
-	headers := s.getDefaultHeaders()
-	headers["Accept"] = "application/json"
-	headers["X-Requested-With"] = "XMLHttpRequest"
-
-	for key, value := range headers {
-		req.Header.Set(key, value)
-	}
+	setAPIHeaders(req.Header)
 
-	client := &http.Client{}
+	// Reuse the shared connection pool for both API calls
+	client := s.httpClient.Client()
 	resp, err := client.Do(req)
 	if err != nil {
 		return nil, fmt.Errorf("failed to get transfer info: %w", err)
@@ -201,10 +212,8 @@ func (s *Service) getWeTransferDownloadInfo(ctx context.Context, rawURL string)
 	}
 
 	// Add headers for POST request
-	headers["Content-Type"] = "application/json"
-	for key, value := range headers {
-		downloadReq.Header.Set(key, value)
-	}
+	setAPIHeaders(downloadReq.Header)
+	downloadReq.Header.Set("Content-Type", "application/json")
 
 	downloadResp, err := client.Do(downloadReq)
 	if err != nil {
@@ -236,9 +245,24 @@ func (s *Service) getWeTransferDownloadInfo(ctx context.Context, rawURL string)
 	}, nil
 }
 
-func (s *Service) getDefaultHeaders() map[string]string {
-	return map[string]string{
-		"Accept-Encoding": "identity",
-		"User-Agent":      "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+// defaultHeaders are sent with every request; built once and never modified
+var defaultHeaders = map[string]string{
+	"Accept-Encoding": "identity",
+	"User-Agent":      "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+}
+
+// setAPIHeaders adds the default headers plus those the WeTransfer API
+// expects from its own web client
+func setAPIHeaders(header http.Header) {
+	for key, value := range defaultHeaders {
+		header.Set(key, value)
 	}
+	header.Set("Accept", "application/json")
+	header.Set("X-Requested-With", "XMLHttpRequest")
+}
+
+// getDefaultHeaders returns the shared default headers. Callers must not
+// modify the returned map.
+func (s *Service) getDefaultHeaders() map[string]string {
+	return defaultHeaders
 }
@@ -8,6 +8,7 @@ import (
 	"testing"
 	"time"
 
+	"github.com/milindmadhukar/cloudget/pkg/utils"
 	"github.com/stretchr/testify/assert"
 	"github.com/stretchr/testify/require"
 )
@@ -19,6 +20,15 @@ func TestNew(t *testing.T) {
 	assert.NotNil(t, service.logger)
 }
 
+func TestNewWithClient(t *testing.T) {
+	httpClient := utils.NewHTTPClient()
+	service := NewWithClient(httpClient)
+	assert.Same(t, httpClient, service.httpClient)
+
+	// A nil client falls back to one of the service's own
+	assert.NotNil(t, NewWithClient(nil).httpClient)
+}
+
 func TestService_GetServiceName(t *testing.T) {
 	service := New()
 	assert.Equal(t, "WeTransfer", service.GetServiceName())
@@ -412,16 +422,18 @@ func TestService_EdgeCases(t *testing.T) {
 		assert.Equal(t, "abc123def456", transferID)
 	})
 
-	t.Run("Case sensitivity limitation", func(t *testing.T) {
+	t.Run("Host is case insensitive", func(t *testing.T) {
 		url := "https://WeTransfer.com/downloads/abc123def456"
 
-		// Both IsSupported and extractTransferID are case sensitive
-		// This is a limitation in the current implementation
-		assert.False(t, service.IsSupported(url))
+		// Host names are case insensitive, so both IsSupported and
+		// extractTransferID accept any casing of the host
+		assert.True(t, service.IsSupported(url))
 
 		transferID, err := service.extractTransferID(url)
-		assert.Error(t, err)
-		assert.Equal(t, "", transferID)
+		assert.NoError(t, err)
+		assert.Equal(t, "abc123def456", transferID)
+
+		assert.True(t, service.IsSupported("https://WE.TL/t-abc123"))
 	})
 
 	t.Run("Different protocols", func(t *testing.T) {
@@ -0,0 +1,102 @@
+package utils
+
+import (
+	"io"
+	"os"
+	"unsafe"
+)
+
+// directIOAlignment is the offset, length and memory alignment O_DIRECT
+// writes need on common Linux filesystems
+const directIOAlignment = 4096
+
+// alignedBuffer returns a size-byte slice whose first byte sits on a
+// directIOAlignment boundary, as O_DIRECT requires of user buffers
+func alignedBuffer(size int) []byte {
+	buf := make([]byte, size+directIOAlignment)
+	offset := 0
+	if rem := int(uintptr(unsafe.Pointer(&buf[0])) % directIOAlignment); rem != 0 {
+		offset = directIOAlignment - rem
+	}
+	return buf[offset : offset+size : offset+size]
+}
+
+// openDirectIO opens an O_DIRECT descriptor for filename next to the
+// regular one. It returns nil when direct I/O cannot be used, in which case
+// writes simply go through the page cache.
+func (h *HTTPClient) openDirectIO(filename string, chunkSize int64) *os.File {
+	if chunkSize%directIOAlignment != 0 {
+		h.logger.Warnf("Direct I/O needs a chunk size that is a multiple of %d bytes, using buffered writes", directIOAlignment)
+		return nil
+	}
+
+	file, err := openDirect(filename)
+	if err != nil {
+		h.logger.Warnf("Direct I/O unavailable, using buffered writes: %v", err)
+		return nil
+	}
+
+	return file
+}
+
+// directChunkWriter stages one chunk at a time in an aligned buffer and
+// writes it out through an O_DIRECT descriptor in aligned blocks. A tail
+// that is not a whole number of blocks (the end of the file) is written
+// through tail, a regular descriptor for the same file.
+type directChunkWriter struct {
+	direct io.WriterAt
+	tail   io.WriterAt
+	buf    []byte
+	n      int
+	off    int64
+}
+
+func newDirectChunkWriter(direct, tail io.WriterAt) *directChunkWriter {
+	return &directChunkWriter{
+		direct: direct,
+		tail:   tail,
+		buf:    alignedBuffer(copyBufferSize),
+	}
+}
+
+// reset starts a new chunk at file offset off, dropping anything staged
+func (w *directChunkWriter) reset(off int64) {
+	w.off = off
+	w.n = 0
+}
+
+func (w *directChunkWriter) Write(p []byte) (int, error) {
+	written := 0
+	for len(p) > 0 {
+		c := copy(w.buf[w.n:], p)
+		w.n += c
+		written += c
+		p = p[c:]
+
+		if w.n == len(w.buf) {
+			if err := w.flush(); err != nil {
+				return written, err
+			}
+		}
+	}
+	return written, nil
+}
+
+// flush writes out everything staged so far
+func (w *directChunkWriter) flush() error {
+	aligned := w.n &^ (directIOAlignment - 1)
+	if aligned > 0 {
+		if _, err := w.direct.WriteAt(w.buf[:aligned], w.off); err != nil {
+			return err
+		}
+	}
+	if aligned < w.n {
+		if _, err := w.tail.WriteAt(w.buf[aligned:w.n], w.off+int64(aligned)); err != nil {
+			return err
+		}
+	}
+
+	w.off += int64(w.n)
+	w.n = 0
+	return nil
+}
@@ -0,0 +1,11 @@
+package utils
+
+import (
+	"os"
+	"syscall"
+)
+
+// openDirect opens an existing file for writing, bypassing the page cache
+func openDirect(name string) (*os.File, error) {
+	return os.OpenFile(name, os.O_WRONLY|syscall.O_DIRECT, 0)
+}
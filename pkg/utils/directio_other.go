@@ -0,0 +1,13 @@
+//go:build !linux
+
+package utils
+
+import (
+	"errors"
+	"os"
+)
+
+// openDirect is only implemented on Linux
+func openDirect(name string) (*os.File, error) {
+	return nil, errors.New("direct I/O is not supported on this platform")
+}
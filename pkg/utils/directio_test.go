@@ -0,0 +1,80 @@
+package utils
+
+import (
+	"bytes"
+	"testing"
+	"unsafe"
+)
+
+type recordedWrite struct {
+	off  int64
+	size int
+}
+
+type recordingWriterAt struct {
+	data   []byte
+	writes []recordedWrite
+}
+
+func (w *recordingWriterAt) WriteAt(p []byte, off int64) (int, error) {
+	copy(w.data[off:], p)
+	w.writes = append(w.writes, recordedWrite{off: off, size: len(p)})
+	return len(p), nil
+}
+
+func TestAlignedBuffer(t *testing.T) {
+	buf := alignedBuffer(copyBufferSize)
+	if len(buf) != copyBufferSize {
+		t.Errorf("alignedBuffer length = %d, want %d", len(buf), copyBufferSize)
+	}
+	if addr := uintptr(unsafe.Pointer(&buf[0])); addr%directIOAlignment != 0 {
+		t.Errorf("alignedBuffer address %#x is not %d-byte aligned", addr, directIOAlignment)
+	}
+}
+
+func TestDirectChunkWriter(t *testing.T) {
+	// A last chunk that spans more than one staging buffer and ends mid-block
+	size := copyBufferSize + 3*directIOAlignment + 100
+	start := int64(8 * directIOAlignment)
+
+	content := make([]byte, size)
+	for i := range content {
+		content[i] = byte(i % 251)
+	}
+
+	direct := &recordingWriterAt{data: make([]byte, int(start)+size)}
+	tail := &recordingWriterAt{data: make([]byte, int(start)+size)}
+	w := newDirectChunkWriter(direct, tail)
+	w.reset(start)
+
+	// Write in odd-sized pieces, like network reads
+	for rest := content; len(rest) > 0; {
+		n := 1000
+		if n > len(rest) {
+			n = len(rest)
+		}
+		if _, err := w.Write(rest[:n]); err != nil {
+			t.Fatalf("Write failed: %v", err)
+		}
+		rest = rest[n:]
+	}
+	if err := w.flush(); err != nil {
+		t.Fatalf("flush failed: %v", err)
+	}
+
+	for _, write := range direct.writes {
+		if write.off%directIOAlignment != 0 || write.size%directIOAlignment != 0 {
+			t.Errorf("Unaligned direct write: offset %d, size %d", write.off, write.size)
+		}
+	}
+
+	if len(tail.writes) != 1 || tail.writes[0].size != 100 {
+		t.Errorf("Expected a single 100 byte tail write, got %v", tail.writes)
+	}
+
+	got := append([]byte{}, direct.data[start:]...)
+	copy(got[size-100:], tail.data[int(start)+size-100:])
+	if !bytes.Equal(got, content) {
+		t.Error("Written content does not match input")
+	}
+}
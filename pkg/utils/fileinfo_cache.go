@@ -0,0 +1,139 @@
+package utils
+
+import (
+	"crypto/sha1"
+	"encoding/hex"
+	"encoding/json"
+	"fmt"
+	"os"
+	"path/filepath"
+	"strings"
+	"time"
+)
+
+// fileInfoCacheTTL is how long cached file info is trusted. Older entries
+// are dropped, so the cache does not grow with every URL ever downloaded.
+const fileInfoCacheTTL = 24 * time.Hour
+
+// FileInfoCache keeps the file info of previously seen URLs on disk, next
+// to the resume data, so downloading the same URL again can skip the HEAD
+// request. Entries are checked against the first response of the download
+// and expire after fileInfoCacheTTL.
+type FileInfoCache struct {
+	dir string
+}
+
+// NewFileInfoCache creates a cache in dir, defaulting to the resume directory
+func NewFileInfoCache(dir string) *FileInfoCache {
+	if dir == "" {
+		dir = filepath.Join(os.TempDir(), "cloudget-resume")
+	}
+
+	os.MkdirAll(dir, 0755)
+
+	c := &FileInfoCache{
+		dir: dir,
+	}
+	c.prune()
+
+	return c
+}
+
+// prune removes expired entries, including those of URLs that are never
+// loaded again
+func (c *FileInfoCache) prune() {
+	entries, err := os.ReadDir(c.dir)
+	if err != nil {
+		return
+	}
+
+	cutoff := time.Now().Add(-fileInfoCacheTTL)
+
+	for _, entry := range entries {
+		if entry.IsDir() || !strings.HasPrefix(entry.Name(), "info_") {
+			continue
+		}
+
+		info, err := entry.Info()
+		if err != nil {
+			continue
+		}
+
+		if info.ModTime().Before(cutoff) {
+			os.Remove(filepath.Join(c.dir, entry.Name())) // Ignore errors for cleanup
+		}
+	}
+}
+
+// Load returns the cached file info for url, or nil if there is none or it
+// has expired. A nil cache never has entries.
+func (c *FileInfoCache) Load(url string) *FileInfo {
+	if c == nil {
+		return nil
+	}
+
+	path := c.path(url)
+	stat, err := os.Stat(path)
+	if err != nil {
+		return nil
+	}
+	if time.Since(stat.ModTime()) > fileInfoCacheTTL {
+		os.Remove(path)
+		return nil
+	}
+
+	data, err := os.ReadFile(path)
+	if err != nil {
+		return nil
+	}
+
+	var info FileInfo
+	if err := json.Unmarshal(data, &info); err != nil {
+		return nil
+	}
+
+	return &info
+}
+
+// Save records the file info for url
+func (c *FileInfoCache) Save(url string, info *FileInfo) error {
+	if c == nil {
+		return nil
+	}
+
+	data, err := json.Marshal(info)
+	if err != nil {
+		return fmt.Errorf("failed to marshal file info: %w", err)
+	}
+
+	tmpPath := c.path(url) + ".tmp"
+	if err := os.WriteFile(tmpPath, data, 0644); err != nil {
+		return fmt.Errorf("failed to write file info cache: %w", err)
+	}
+
+	if err := os.Rename(tmpPath, c.path(url)); err != nil {
+		os.Remove(tmpPath)
+		return fmt.Errorf("failed to write file info cache: %w", err)
+	}
+
+	return nil
+}
+
+// Clear drops the cached file info for url
+func (c *FileInfoCache) Clear(url string) error {
+	if c == nil {
+		return nil
+	}
+
+	err := os.Remove(c.path(url))
+	if err != nil && !os.IsNotExist(err) {
+		return fmt.Errorf("failed to remove file info cache: %w", err)
+	}
+
+	return nil
+}
+
+func (c *FileInfoCache) path(url string) string {
+	sum := sha1.Sum([]byte(url))
+	return filepath.Join(c.dir, fmt.Sprintf("info_%s.json", hex.EncodeToString(sum[:])))
+}
@@ -0,0 +1,52 @@
+package utils
+
+import (
+	"os"
+	"testing"
+	"time"
+)
+
+func TestFileInfoCache_Expiry(t *testing.T) {
+	dir := t.TempDir()
+	cache := NewFileInfoCache(dir)
+
+	fresh := "https://example.com/fresh.bin"
+	stale := "https://example.com/stale.bin"
+	for _, url := range []string{fresh, stale} {
+		if err := cache.Save(url, &FileInfo{URL: url, Size: 42}); err != nil {
+			t.Fatalf("Save failed: %v", err)
+		}
+	}
+
+	old := time.Now().Add(-2 * fileInfoCacheTTL)
+	if err := os.Chtimes(cache.path(stale), old, old); err != nil {
+		t.Fatalf("Failed to age cache entry: %v", err)
+	}
+
+	if info := cache.Load(fresh); info == nil || info.Size != 42 {
+		t.Errorf("Load(fresh) = %+v, want the saved info", info)
+	}
+	if info := cache.Load(stale); info != nil {
+		t.Errorf("Load(stale) = %+v, want nil for an expired entry", info)
+	}
+	if _, err := os.Stat(cache.path(stale)); !os.IsNotExist(err) {
+		t.Error("Expired entry should be removed when loaded")
+	}
+
+	// Entries of URLs that are never loaded again are pruned on startup
+	if err := cache.Save(stale, &FileInfo{URL: stale, Size: 42}); err != nil {
+		t.Fatalf("Save failed: %v", err)
+	}
+	if err := os.Chtimes(cache.path(stale), old, old); err != nil {
+		t.Fatalf("Failed to age cache entry: %v", err)
+	}
+
+	NewFileInfoCache(dir)
+
+	if _, err := os.Stat(cache.path(stale)); !os.IsNotExist(err) {
+		t.Error("Expired entry should be pruned when the cache is opened")
+	}
+	if _, err := os.Stat(cache.path(fresh)); err != nil {
+		t.Errorf("Fresh entry should survive pruning: %v", err)
+	}
+}
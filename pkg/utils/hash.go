@@ -1,6 +1,8 @@
 package utils
 
 import (
+	"bytes"
+	"container/heap"
 	"crypto/md5"
 	"crypto/sha1"
 	"crypto/sha256"
@@ -9,7 +11,10 @@ import (
 	"hash"
 	"io"
 	"os"
+	"runtime"
 	"strings"
+	"sync"
+	"sync/atomic"
 )
 
 // HashCalculator provides file hash calculation functionality
@@ -20,42 +25,69 @@ func NewHashCalculator() *HashCalculator {
 	return &HashCalculator{}
 }
 
-// CalculateHash calculates the hash of a file using the specified algorithm
-func (h *HashCalculator) CalculateHash(filePath string, algorithm string) (string, error) {
-	file, err := os.Open(filePath)
-	if err != nil {
-		return "", fmt.Errorf("failed to open file: %w", err)
-	}
-	defer file.Close()
+// hashBufferSize is the read size used when hashing from disk. Large reads
+// keep syscall overhead well below the cost of the digest itself.
+const hashBufferSize = 1 << 20
 
-	var hasher hash.Hash
-	switch strings.ToLower(algorithm) {
-	case "md5":
-		hasher = md5.New()
-	case "sha1":
-		hasher = sha1.New()
-	case "sha256":
-		hasher = sha256.New()
-	case "sha512":
-		hasher = sha512.New()
-	default:
-		return "", fmt.Errorf("unsupported hash algorithm: %s", algorithm)
-	}
+var hashBufferPool = sync.Pool{
+	New: func() any {
+		buf := make([]byte, hashBufferSize)
+		return &buf
+	},
+}
+
+// hashReader feeds r into hasher using a pooled 1 MiB buffer
+func hashReader(hasher hash.Hash, r io.Reader) error {
+	bufPtr := hashBufferPool.Get().(*[]byte)
+	defer hashBufferPool.Put(bufPtr)
 
-	// Copy file content to hasher in chunks to handle large files efficiently
-	buffer := make([]byte, 32*1024) // 32KB buffer
+	buffer := *bufPtr
 	for {
-		n, err := file.Read(buffer)
+		n, err := r.Read(buffer)
 		if n > 0 {
 			hasher.Write(buffer[:n])
 		}
 		if err == io.EOF {
-			break
+			return nil
 		}
 		if err != nil {
-			return "", fmt.Errorf("failed to read file: %w", err)
+			return err
 		}
 	}
+}
+
+// NewHasher returns a fresh hash.Hash for the given algorithm name
+func NewHasher(algorithm string) (hash.Hash, error) {
+	switch strings.ToLower(algorithm) {
+	case "md5":
+		return md5.New(), nil
+	case "sha1":
+		return sha1.New(), nil
+	case "sha256":
+		return sha256.New(), nil
+	case "sha512":
+		return sha512.New(), nil
+	default:
+		return nil, fmt.Errorf("unsupported hash algorithm: %s", algorithm)
+	}
+}
+
+// CalculateHash calculates the hash of a file using the specified algorithm
+func (h *HashCalculator) CalculateHash(filePath string, algorithm string) (string, error) {
+	file, err := os.Open(filePath)
+	if err != nil {
+		return "", fmt.Errorf("failed to open file: %w", err)
+	}
+	defer file.Close()
+
+	hasher, err := NewHasher(algorithm)
+	if err != nil {
+		return "", err
+	}
+
+	if err := hashReader(hasher, file); err != nil {
+		return "", fmt.Errorf("failed to read file: %w", err)
+	}
 
 	return fmt.Sprintf("%x", hasher.Sum(nil)), nil
 }
@@ -74,9 +106,104 @@ func (h *HashCalculator) VerifyHash(filePath string, expectedHash string, algori
 	return nil
 }
 
-// GetSupportedAlgorithms returns a list of supported hash algorithms
+// CalculateChunkHashes hashes filePath in pieces of chunkSize bytes and
+// returns one digest per piece. Pieces are hashed independently, so the
+// work is spread over every CPU; on large files this checks much faster
+// than a single whole-file digest, which can only use one core.
+func (h *HashCalculator) CalculateChunkHashes(filePath string, algorithm string, chunkSize int64) ([]string, error) {
+	if chunkSize <= 0 {
+		return nil, fmt.Errorf("invalid chunk size: %d", chunkSize)
+	}
+	if _, err := NewHasher(algorithm); err != nil {
+		return nil, err
+	}
+
+	file, err := os.Open(filePath)
+	if err != nil {
+		return nil, fmt.Errorf("failed to open file: %w", err)
+	}
+	defer file.Close()
+
+	info, err := file.Stat()
+	if err != nil {
+		return nil, fmt.Errorf("failed to stat file: %w", err)
+	}
+
+	chunks := calculateChunks(info.Size(), chunkSize)
+	hashes := make([]string, len(chunks))
+
+	workers := runtime.NumCPU()
+	if workers > len(chunks) {
+		workers = len(chunks)
+	}
+
+	var (
+		wg       sync.WaitGroup
+		next     int64 = -1
+		failed   atomic.Bool
+		errOnce  sync.Once
+		firstErr error
+	)
+
+	for w := 0; w < workers; w++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+
+			for !failed.Load() {
+				i := int(atomic.AddInt64(&next, 1))
+				if i >= len(chunks) {
+					return
+				}
+
+				hasher, _ := NewHasher(algorithm)
+				chunk := chunks[i]
+				if err := hashReader(hasher, io.NewSectionReader(file, chunk.Start, chunk.Size)); err != nil {
+					errOnce.Do(func() { firstErr = fmt.Errorf("failed to read file: %w", err) })
+					failed.Store(true)
+					return
+				}
+				hashes[i] = fmt.Sprintf("%x", hasher.Sum(nil))
+			}
+		}()
+	}
+
+	wg.Wait()
+	if firstErr != nil {
+		return nil, firstErr
+	}
+
+	return hashes, nil
+}
+
+// VerifyChunkHashes verifies a file against the expected digest of each
+// chunkSize piece, as produced by CalculateChunkHashes
+func (h *HashCalculator) VerifyChunkHashes(filePath string, expectedHashes []string, algorithm string, chunkSize int64) error {
+	actualHashes, err := h.CalculateChunkHashes(filePath, algorithm, chunkSize)
+	if err != nil {
+		return fmt.Errorf("failed to calculate hash: %w", err)
+	}
+
+	if len(actualHashes) != len(expectedHashes) {
+		return fmt.Errorf("hash mismatch: expected %d chunks, got %d", len(expectedHashes), len(actualHashes))
+	}
+
+	for i, actual := range actualHashes {
+		if !strings.EqualFold(actual, strings.TrimSpace(expectedHashes[i])) {
+			return fmt.Errorf("hash mismatch in chunk %d: expected %s, got %s", i, expectedHashes[i], actual)
+		}
+	}
+
+	return nil
+}
+
+// supportedAlgorithms lists the algorithms NewHasher accepts
+var supportedAlgorithms = []string{"md5", "sha1", "sha256", "sha512"}
+
+// GetSupportedAlgorithms returns a list of supported hash algorithms. The
+// slice is shared between callers and must not be modified.
 func (h *HashCalculator) GetSupportedAlgorithms() []string {
-	return []string{"md5", "sha1", "sha256", "sha512"}
+	return supportedAlgorithms
 }
 
 // DetectHashAlgorithm attempts to detect the hash algorithm based on hash length
@@ -95,3 +222,152 @@ func (h *HashCalculator) DetectHashAlgorithm(hashValue string) string {
 		return "unknown"
 	}
 }
+
+// hashWindowBytes bounds how much downloaded data orderedHasher keeps in
+// memory while waiting for earlier chunks to arrive
+const hashWindowBytes = 64 * 1024 * 1024
+
+// pendingChunk is a finished chunk waiting for its turn to be hashed. A nil
+// data means the chunk is read back from the file instead.
+type pendingChunk struct {
+	index int
+	data  *bytes.Buffer
+}
+
+// chunkHeap is a min-heap of pending chunks ordered by chunk index
+type chunkHeap []pendingChunk
+
+func (h chunkHeap) Len() int           { return len(h) }
+func (h chunkHeap) Less(i, j int) bool { return h[i].index < h[j].index }
+func (h chunkHeap) Swap(i, j int)      { h[i], h[j] = h[j], h[i] }
+func (h *chunkHeap) Push(x any)        { *h = append(*h, x.(pendingChunk)) }
+func (h *chunkHeap) Pop() any {
+	old := *h
+	item := old[len(old)-1]
+	*h = old[:len(old)-1]
+	return item
+}
+
+// orderedHasher feeds the chunks of a download into a hash in file order
+// while workers finish them in any order. Chunks close enough to the next
+// one to hash are kept in memory, so the common case never touches the
+// disk again; chunks further ahead are read back from the file later.
+type orderedHasher struct {
+	hasher hash.Hash
+	file   io.ReaderAt
+	chunks []ChunkInfo
+	window int
+	bufs   sync.Pool
+
+	mu      sync.Mutex
+	cond    *sync.Cond
+	pending chunkHeap
+	next    int
+	closed  bool
+}
+
+func newOrderedHasher(hasher hash.Hash, file io.ReaderAt, chunks []ChunkInfo, chunkSize int64) *orderedHasher {
+	window := int(hashWindowBytes / chunkSize)
+	if window < 1 {
+		window = 1
+	}
+
+	o := &orderedHasher{
+		hasher: hasher,
+		file:   file,
+		chunks: chunks,
+		window: window,
+	}
+	o.cond = sync.NewCond(&o.mu)
+	o.bufs.New = func() any {
+		return bytes.NewBuffer(make([]byte, 0, chunkSize))
+	}
+	return o
+}
+
+// capture returns a buffer to collect chunk i in, or nil if the chunk is
+// too far ahead and should be read back from the file instead. A nil
+// orderedHasher captures nothing.
+func (o *orderedHasher) capture(i int) *bytes.Buffer {
+	if o == nil {
+		return nil
+	}
+
+	o.mu.Lock()
+	inWindow := i < o.next+o.window
+	o.mu.Unlock()
+
+	if !inWindow {
+		return nil
+	}
+	return o.bufs.Get().(*bytes.Buffer)
+}
+
+// add hands over finished chunk i along with its captured data, if any
+func (o *orderedHasher) add(i int, data *bytes.Buffer) {
+	if o == nil {
+		return
+	}
+
+	o.mu.Lock()
+	heap.Push(&o.pending, pendingChunk{index: i, data: data})
+	o.mu.Unlock()
+	o.cond.Signal()
+}
+
+// close tells run that no more chunks will be added
+func (o *orderedHasher) close() {
+	if o == nil {
+		return
+	}
+
+	o.mu.Lock()
+	o.closed = true
+	o.mu.Unlock()
+	o.cond.Signal()
+}
+
+// run hashes chunks as soon as the next one in file order is available. It
+// returns once every chunk is hashed, or the hasher is closed with the
+// next chunk still missing.
+func (o *orderedHasher) run() error {
+	o.mu.Lock()
+	defer o.mu.Unlock()
+
+	for o.next < len(o.chunks) {
+		for !o.closed && !o.ready() {
+			o.cond.Wait()
+		}
+		if !o.ready() {
+			return nil
+		}
+
+		item := heap.Pop(&o.pending).(pendingChunk)
+		o.mu.Unlock()
+		err := o.hashChunk(item)
+		o.mu.Lock()
+
+		if err != nil {
+			return err
+		}
+		o.next++
+	}
+
+	return nil
+}
+
+func (o *orderedHasher) ready() bool {
+	return len(o.pending) > 0 && o.pending[0].index == o.next
+}
+
+func (o *orderedHasher) hashChunk(item pendingChunk) error {
+	if item.data == nil {
+		chunk := o.chunks[item.index]
+		return hashReader(o.hasher, io.NewSectionReader(o.file, chunk.Start, chunk.Size))
+	}
+
+	o.hasher.Write(item.data.Bytes())
+	item.data.Reset()
+	o.bufs.Put(item.data)
+	return nil
+}
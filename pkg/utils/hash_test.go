@@ -1,6 +1,10 @@
 package utils
 
 import (
+	"bytes"
+	"crypto/md5"
+	"crypto/sha256"
+	"fmt"
 	"os"
 	"path/filepath"
 	"testing"
@@ -156,8 +160,8 @@ func TestCalculateHashLargeFile(t *testing.T) {
 	tmpDir := t.TempDir()
 	testFile := filepath.Join(tmpDir, "large.txt")
 
-	// Create a file larger than the buffer size (32KB)
-	content := make([]byte, 64*1024) // 64KB
+	// Create a file spanning several reads
+	content := make([]byte, 3*hashBufferSize+17)
 	for i := range content {
 		content[i] = byte(i % 256)
 	}
@@ -176,4 +180,110 @@ func TestCalculateHashLargeFile(t *testing.T) {
 	if len(hash) != 32 {
 		t.Errorf("MD5 hash length = %d, want 32", len(hash))
 	}
+
+	if expected := fmt.Sprintf("%x", md5.Sum(content)); hash != expected {
+		t.Errorf("CalculateHash for large file = %s, want %s", hash, expected)
+	}
+}
+
+func TestOrderedHasher(t *testing.T) {
+	content := make([]byte, 10*1024+5)
+	for i := range content {
+		content[i] = byte(i % 253)
+	}
+	chunks := calculateChunks(int64(len(content)), 1024)
+
+	hasher := sha256.New()
+	o := newOrderedHasher(hasher, bytes.NewReader(content), chunks, 1024)
+
+	done := make(chan error, 1)
+	go func() { done <- o.run() }()
+
+	// Deliver chunks out of order, some captured in memory and some left
+	// to be read back from the file
+	order := []int{3, 1, 0, 7, 2, 10, 4, 9, 5, 8, 6}
+	for _, i := range order {
+		var data *bytes.Buffer
+		if i%2 == 0 {
+			data = o.capture(i)
+			chunk := chunks[i]
+			data.Write(content[chunk.Start : chunk.End+1])
+		}
+		o.add(i, data)
+	}
+	o.close()
+
+	if err := <-done; err != nil {
+		t.Fatalf("run failed: %v", err)
+	}
+
+	if expected := sha256.Sum256(content); !bytes.Equal(hasher.Sum(nil), expected[:]) {
+		t.Error("Ordered hash does not match hash of content")
+	}
+}
+
+func TestOrderedHasherCaptureWindow(t *testing.T) {
+	chunkSize := int64(hashWindowBytes / 4)
+	chunks := calculateChunks(8*chunkSize, chunkSize)
+	o := newOrderedHasher(sha256.New(), bytes.NewReader(nil), chunks, chunkSize)
+
+	if o.capture(3) == nil {
+		t.Error("Chunk inside the window should be captured")
+	}
+	if o.capture(4) != nil {
+		t.Error("Chunk beyond the window should be read back from the file")
+	}
+
+	var none *orderedHasher
+	if none.capture(0) != nil {
+		t.Error("nil orderedHasher should capture nothing")
+	}
+}
+
+func TestCalculateChunkHashes(t *testing.T) {
+	calc := NewHashCalculator()
+
+	tmpDir := t.TempDir()
+	testFile := filepath.Join(tmpDir, "chunks.bin")
+
+	const chunkSize = 1000
+	content := make([]byte, 10*chunkSize+17)
+	for i := range content {
+		content[i] = byte(i % 251)
+	}
+	if err := os.WriteFile(testFile, content, 0644); err != nil {
+		t.Fatalf("Failed to create test file: %v", err)
+	}
+
+	hashes, err := calc.CalculateChunkHashes(testFile, "sha256", chunkSize)
+	if err != nil {
+		t.Fatalf("CalculateChunkHashes failed: %v", err)
+	}
+
+	if len(hashes) != 11 {
+		t.Fatalf("CalculateChunkHashes returned %d hashes, want 11", len(hashes))
+	}
+
+	for i, hash := range hashes {
+		end := (i + 1) * chunkSize
+		if end > len(content) {
+			end = len(content)
+		}
+		if expected := fmt.Sprintf("%x", sha256.Sum256(content[i*chunkSize:end])); hash != expected {
+			t.Errorf("Chunk %d hash = %s, want %s", i, hash, expected)
+		}
+	}
+
+	if err := calc.VerifyChunkHashes(testFile, hashes, "sha256", chunkSize); err != nil {
+		t.Errorf("VerifyChunkHashes with correct hashes failed: %v", err)
+	}
+
+	hashes[4] = "incorrecthash"
+	if err := calc.VerifyChunkHashes(testFile, hashes, "sha256", chunkSize); err == nil {
+		t.Error("Expected error for incorrect chunk hash, got nil")
+	}
+
+	if err := calc.VerifyChunkHashes(testFile, hashes[:3], "sha256", chunkSize); err == nil {
+		t.Error("Expected error for missing chunk hashes, got nil")
+	}
 }
@@ -0,0 +1,126 @@
+package utils
+
+import (
+	"net/url"
+	"strings"
+)
+
+// URLHost returns the host name of rawURL in lower case, without port or a
+// leading "www.". URLs written without a scheme, such as "we.tl/t-abc123",
+// are read as starting with the host.
+func URLHost(rawURL string) string {
+	// Plain URLs are sliced in place; anything url.Parse might reject or
+	// rewrite (userinfo, IPv6 literals, escapes, control bytes) takes the
+	// full parse so both paths agree
+	if !plainURL(rawURL) {
+		return parseURLHost(rawURL)
+	}
+
+	rest := rawURL
+	if i := strings.Index(rest, "://"); i >= 0 {
+		if !isScheme(rest[:i]) {
+			return parseURLHost(rawURL)
+		}
+		rest = rest[i+len("://"):]
+	}
+
+	host := rest
+	if end := strings.IndexAny(host, "/?#"); end >= 0 {
+		host = host[:end]
+	}
+
+	if colon := strings.LastIndexByte(host, ':'); colon >= 0 {
+		if !isDigits(host[colon+1:]) {
+			return parseURLHost(rawURL)
+		}
+		host = host[:colon]
+	}
+
+	for i := 0; i < len(host); i++ {
+		if !isHostChar(host[i]) {
+			return parseURLHost(rawURL)
+		}
+	}
+
+	return strings.TrimPrefix(strings.ToLower(host), "www.")
+}
+
+// HostMatches reports whether the host of rawURL is one of domains or a
+// subdomain of one. Only the host is looked at, so a domain name showing
+// up in the path or query does not count.
+func HostMatches(rawURL string, domains ...string) bool {
+	host := URLHost(rawURL)
+	if host == "" {
+		return false
+	}
+
+	for _, domain := range domains {
+		if host == domain ||
+			(strings.HasSuffix(host, domain) && host[len(host)-len(domain)-1] == '.') {
+			return true
+		}
+	}
+
+	return false
+}
+
+// parseURLHost is URLHost done by url.Parse, for URLs the fast path does
+// not handle
+func parseURLHost(rawURL string) string {
+	if !strings.Contains(rawURL, "://") {
+		rawURL = "//" + rawURL
+	}
+
+	parsed, err := url.Parse(rawURL)
+	if err != nil {
+		return ""
+	}
+
+	return strings.TrimPrefix(strings.ToLower(parsed.Hostname()), "www.")
+}
+
+// plainURL reports whether rawURL has none of the bytes that make url.Parse
+// unescape, split off userinfo or fail
+func plainURL(rawURL string) bool {
+	for i := 0; i < len(rawURL); i++ {
+		switch c := rawURL[i]; {
+		case c < 0x20, c == 0x7f, c == '%', c == '@', c == '[':
+			return false
+		}
+	}
+	return true
+}
+
+func isScheme(s string) bool {
+	if s == "" || !isLetter(s[0]) {
+		return false
+	}
+	for i := 1; i < len(s); i++ {
+		c := s[i]
+		if !isLetter(c) && !isDigit(c) && c != '+' && c != '-' && c != '.' {
+			return false
+		}
+	}
+	return true
+}
+
+func isDigits(s string) bool {
+	for i := 0; i < len(s); i++ {
+		if !isDigit(s[i]) {
+			return false
+		}
+	}
+	return true
+}
+
+func isHostChar(c byte) bool {
+	return isLetter(c) || isDigit(c) || c == '-' || c == '.' || c == '_' || c == '~'
+}
+
+func isLetter(c byte) bool {
+	return 'a' <= c && c <= 'z' || 'A' <= c && c <= 'Z'
+}
+
+func isDigit(c byte) bool {
+	return '0' <= c && c <= '9'
+}
@@ -0,0 +1,67 @@
+package utils
+
+import "testing"
+
+func TestHostMatches(t *testing.T) {
+	tests := []struct {
+		url      string
+		expected bool
+	}{
+		{"https://dropbox.com/s/abc/file.pdf", true},
+		{"https://www.dropbox.com/s/abc/file.pdf", true},
+		{"https://dl.dropbox.com/s/abc/file.pdf", true},
+		{"https://WWW.Dropbox.com/s/abc/file.pdf", true},
+		{"HTTPS://DROPBOX.COM/s/abc/file.pdf", true},
+		{"https://dl.DropBox.com/s/abc/file.pdf", true},
+		{"https://dropbox.com:443/s/abc/file.pdf", true},
+		{"dropbox.com/s/abc/file.pdf", true},
+		{"https://example.com/dropbox.com/file.pdf", false},
+		{"https://example.com/?next=dropbox.com", false},
+		{"https://notdropbox.com/s/abc/file.pdf", false},
+		{"https://dropbox.com.example.com/s/abc", false},
+		{"/path/only", false},
+		{"", false},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.url, func(t *testing.T) {
+			if result := HostMatches(tt.url, "dropbox.com"); result != tt.expected {
+				t.Errorf("HostMatches(%q) = %v, want %v", tt.url, result, tt.expected)
+			}
+		})
+	}
+}
+
+func TestURLHost(t *testing.T) {
+	tests := []struct {
+		url      string
+		expected string
+	}{
+		{"https://www.dropbox.com/s/abc/file.pdf?dl=0", "dropbox.com"},
+		{"https://drive.google.com:443/file/d/abc", "drive.google.com"},
+		{"we.tl/t-abc123", "we.tl"},
+		{"https://WWW.Dropbox.com/s/abc/file.pdf", "dropbox.com"},
+		{"HTTPS://Drive.Google.COM:443/file/d/abc", "drive.google.com"},
+		{"User:Pass@WWW.WeTransfer.com/downloads/abc", "wetransfer.com"},
+		{"user:pass@www.wetransfer.com/downloads/abc", "wetransfer.com"},
+		{"https://[::1]:8080/file", "::1"},
+		{"https://%64ropbox.com/s/abc", ""},
+		{"https://dropbox.com:port/s/abc", ""},
+		{"https://dropbox.com/%zz", ""},
+		{"example.com/?next=https://dropbox.com", ""},
+		{"/path/only", ""},
+		{"", ""},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.url, func(t *testing.T) {
+			if result := URLHost(tt.url); result != tt.expected {
+				t.Errorf("URLHost(%q) = %q, want %q", tt.url, result, tt.expected)
+			}
+			// The sliced fast path must agree with url.Parse
+			if parsed := parseURLHost(tt.url); parsed != tt.expected {
+				t.Errorf("parseURLHost(%q) = %q, want %q", tt.url, parsed, tt.expected)
+			}
+		})
+	}
+}
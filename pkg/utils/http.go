@@ -1,8 +1,14 @@
 package utils
 
 import (
+	"bytes"
 	"context"
+	"errors"
 	"fmt"
+	"hash"
+	"io"
+	"mime"
+	"net"
 	"net/http"
 	"net/url"
 	"os"
@@ -10,15 +16,22 @@ import (
 	"regexp"
 	"strconv"
 	"strings"
+	"sync"
+	"sync/atomic"
 	"time"
 
 	"github.com/go-resty/resty/v2"
+	"github.com/milindmadhukar/cloudget/pkg/interfaces"
 	"github.com/sirupsen/logrus"
 )
 
 type HTTPClient struct {
 	client *resty.Client
-	logger *logrus.Logger
+	// transfer shares client's connections but has no overall time limit,
+	// since a download body takes as long as it takes; a stall timer bounds
+	// each request instead
+	transfer *resty.Client
+	logger   *logrus.Logger
 }
 
 type ChunkInfo struct {
@@ -28,36 +41,153 @@ type ChunkInfo struct {
 }
 
 type DownloadOptions struct {
-	ChunkSize    int64
-	MaxRetries   int
-	RetryDelay   time.Duration
-	Headers      map[string]string
-	UserAgent    string
-	Timeout      time.Duration
+	// ChunkSize is the unit of progress, hashing and resume. Zero picks one
+	// from the file size, see chunkSizeFor.
+	ChunkSize      int64
+	MaxConnections int
+	MaxRetries     int
+	RetryDelay     time.Duration
+	Headers        map[string]string
+	UserAgent      string
+	// Timeout is how long a download request may go without receiving any
+	// data before it is abandoned and retried. Defaults to 30s.
+	Timeout time.Duration
+	// DirectIO writes chunked downloads with O_DIRECT where supported,
+	// keeping one-off large files out of the page cache
+	DirectIO bool
+	// AdaptiveConnections lets chunked downloads add or drop connections
+	// (up to 32) based on measured throughput, starting at MaxConnections
+	AdaptiveConnections bool
+	// RangeSize is the size of each HTTP range request; adjacent chunks are
+	// coalesced up to it. Defaults to a quarter of each connection's share of
+	// the file, kept between 16MB and 32MB but no more than the whole share,
+	// and never below ChunkSize.
+	RangeSize int64
+	// ProgressFunc is called periodically while chunked downloads run,
+	// from a single goroutine
 	ProgressFunc func(downloaded, total int64)
+	// Hasher, if set, receives the file content in order as it is downloaded
+	Hasher hash.Hash
+	// ResumeManager, if set, records finished chunks so that an interrupted
+	// chunked download skips them on the next attempt
+	ResumeManager interfaces.ResumeManager
+	// ResumeKey identifies the download to ResumeManager; defaults to the URL
+	ResumeKey string
+	// ResumeFunc, if set, is called before a chunked download starts with
+	// the number of chunks kept from an earlier attempt, out of total
+	ResumeFunc func(completed, total int)
+	// FileInfoCache, if set, lets repeated downloads of a URL skip the HEAD
+	// request
+	FileInfoCache *FileInfoCache
+}
+
+const (
+	defaultMaxConnections = 8
+	defaultRangeSize      = 16 * 1024 * 1024
+	// maxAutoRangeSize caps the range size picked for large files
+	maxAutoRangeSize = 32 * 1024 * 1024
+	// Chunk sizes picked by chunkSizeFor stay within these bounds
+	minAutoChunkSize = 1024 * 1024
+	maxAutoChunkSize = 16 * 1024 * 1024
+	// chunksPerConnection is how many chunks chunkSizeFor aims to give each
+	// connection, enough to keep it busy while the slowest chunks finish
+	chunksPerConnection = 4
+	// copyBufferSize is the size of the buffer each chunk worker reuses to
+	// move response bodies into the file
+	copyBufferSize = 256 * 1024
+	// simpleBufferSize is the read size for single-stream downloads, and
+	// pipelineDepth how many of those reads may wait for the disk writer
+	simpleBufferSize = 256 * 1024
+	pipelineDepth    = 4
+)
+
+// minIdleConnsPerHost is the smallest keep-alive pool kept per host. It
+// covers the connection tuner's ceiling, so connections it adds mid-download
+// are reused by the next range instead of being closed.
+const minIdleConnsPerHost = 64
+
+// newTransport returns the connection pool used for all requests. The
+// defaults keep only a couple of idle connections per host, which forces
+// chunk workers to reconnect constantly; here the pool holds enough for
+// downloads using up to connections each, with room left for the services'
+// own requests to the same host.
+func newTransport(connections int) *http.Transport {
+	idlePerHost := max(minIdleConnsPerHost, 2*connections)
+
+	dialer := &net.Dialer{
+		Timeout:   30 * time.Second,
+		KeepAlive: 30 * time.Second,
+		// Fall back from IPv6 to IPv4 quickly on dual-stack CDNs
+		FallbackDelay: 100 * time.Millisecond,
+	}
+
+	return &http.Transport{
+		Proxy:                 http.ProxyFromEnvironment,
+		DialContext:           dialer.DialContext,
+		ForceAttemptHTTP2:     true,
+		MaxIdleConns:          max(100, 2*idlePerHost),
+		MaxIdleConnsPerHost:   idlePerHost,
+		MaxConnsPerHost:       0, // no cap, the downloader limits concurrency itself
+		IdleConnTimeout:       90 * time.Second,
+		TLSHandshakeTimeout:   10 * time.Second,
+		ExpectContinueTimeout: 1 * time.Second,
+	}
 }
 
 func NewHTTPClient() *HTTPClient {
-	client := resty.New()
+	return NewHTTPClientWithPool(defaultMaxConnections)
+}
+
+// NewHTTPClientWithPool creates a client whose connection pool is sized for
+// downloads that use up to connections connections each
+func NewHTTPClientWithPool(connections int) *HTTPClient {
+	transport := newTransport(connections)
+
+	client := newRestyClient(transport)
 	client.SetTimeout(30 * time.Second)
-	client.SetRetryCount(3)
-	client.SetRetryWaitTime(2 * time.Second)
-	client.SetRetryMaxWaitTime(10 * time.Second)
-	client.SetHeader("User-Agent", "Go-Downloader/1.0")
 
 	logger := logrus.New()
 	logger.SetLevel(logrus.InfoLevel)
 
 	return &HTTPClient{
-		client: client,
-		logger: logger,
+		client:   client,
+		transfer: newRestyClient(transport),
+		logger:   logger,
 	}
 }
 
+func newRestyClient(transport http.RoundTripper) *resty.Client {
+	client := resty.New()
+	client.SetTransport(transport)
+	client.SetRetryCount(3)
+	client.SetRetryWaitTime(2 * time.Second)
+	client.SetRetryMaxWaitTime(10 * time.Second)
+	client.SetHeader("User-Agent", "Go-Downloader/1.0")
+	return client
+}
+
 func (h *HTTPClient) SetLogger(logger *logrus.Logger) {
 	h.logger = logger
 }
 
+// Client returns a net/http client that shares this client's connection
+// pool, for callers that need to build requests themselves. Only the
+// transport is shared: the client has no overall timeout, so it can carry
+// transfers of any length, and it keeps no cookies.
+func (h *HTTPClient) Client() *http.Client {
+	return &http.Client{Transport: h.client.GetClient().Transport}
+}
+
+// NoRedirectClient is like Client but returns redirect responses to the
+// caller instead of following them
+func (h *HTTPClient) NoRedirectClient() *http.Client {
+	client := h.Client()
+	client.CheckRedirect = func(req *http.Request, via []*http.Request) error {
+		return http.ErrUseLastResponse
+	}
+	return client
+}
+
 func (h *HTTPClient) GetFileInfo(ctx context.Context, urlStr string, headers map[string]string) (*FileInfo, error) {
 	req := h.client.R().SetContext(ctx)
 
@@ -70,21 +200,64 @@ func (h *HTTPClient) GetFileInfo(ctx context.Context, urlStr string, headers map
 		return nil, fmt.Errorf("failed to get file info: %w", err)
 	}
 
-	if resp.StatusCode() != http.StatusOK && resp.StatusCode() != http.StatusPartialContent {
+	headOK := resp.StatusCode() == http.StatusOK || resp.StatusCode() == http.StatusPartialContent
+	if headOK && resp.Header().Get("Accept-Ranges") == "bytes" {
+		return newFileInfo(urlStr, resp.StatusCode(), resp.Header(), false), nil
+	}
+
+	// Plenty of servers reject HEAD or leave Accept-Ranges out of it while
+	// serving ranges fine, which would otherwise cost the download its
+	// parallelism. Asking for the first byte settles it either way.
+	if statusCode, header, err := h.probeRange(ctx, urlStr, headers); err == nil {
+		return newFileInfo(urlStr, statusCode, header, true), nil
+	}
+
+	if !headOK {
 		return nil, fmt.Errorf("unexpected status code: %d", resp.StatusCode())
 	}
+	return newFileInfo(urlStr, resp.StatusCode(), resp.Header(), false), nil
+}
+
+// probeDrainLimit is how much of a 200 reply to a range probe is read off
+// so the connection can be reused; larger bodies are dropped with it
+const probeDrainLimit = 64 * 1024
+
+// probeRange requests the first byte of urlStr and returns the reply's
+// status and headers. Only a 200 or 206 counts as an answer.
+func (h *HTTPClient) probeRange(ctx context.Context, urlStr string, headers map[string]string) (int, http.Header, error) {
+	req := h.client.R().SetContext(ctx).SetDoNotParseResponse(true)
+	if headers != nil {
+		req.SetHeaders(headers)
+	}
+	req.SetHeader("Range", "bytes=0-0")
 
+	resp, err := req.Get(urlStr)
+	if err != nil {
+		return 0, nil, err
+	}
+	body := resp.RawBody()
+	io.CopyN(io.Discard, body, probeDrainLimit)
+	body.Close()
+
+	if resp.StatusCode() != http.StatusOK && resp.StatusCode() != http.StatusPartialContent {
+		return 0, nil, fmt.Errorf("unexpected status code: %d", resp.StatusCode())
+	}
+	return resp.StatusCode(), resp.Header(), nil
+}
+
+// newFileInfo builds the file info for urlStr from the headers of a HEAD
+// reply, or of a range probe if probed. A probe's status is what decides
+// range support, whatever Accept-Ranges says.
+func newFileInfo(urlStr string, statusCode int, header http.Header, probed bool) *FileInfo {
 	fileInfo := &FileInfo{
 		URL: urlStr,
 	}
 
-	if contentLength := resp.Header().Get("Content-Length"); contentLength != "" {
-		if size, err := strconv.ParseInt(contentLength, 10, 64); err == nil {
-			fileInfo.Size = size
-		}
+	if size, ok := reportedSize(statusCode, header); ok {
+		fileInfo.Size = size
 	}
 
-	if contentDisposition := resp.Header().Get("Content-Disposition"); contentDisposition != "" {
+	if contentDisposition := header.Get("Content-Disposition"); contentDisposition != "" {
 		if filename := extractFilename(contentDisposition); filename != "" {
 			fileInfo.Filename = filename
 		}
@@ -99,31 +272,52 @@ func (h *HTTPClient) GetFileInfo(ctx context.Context, urlStr string, headers map
 		}
 	}
 
-	fileInfo.SupportsRangeRequests = resp.Header().Get("Accept-Ranges") == "bytes"
+	if probed {
+		fileInfo.SupportsRangeRequests = statusCode == http.StatusPartialContent
+	} else {
+		fileInfo.SupportsRangeRequests = header.Get("Accept-Ranges") == "bytes"
+	}
 
-	if etag := resp.Header().Get("ETag"); etag != "" {
+	if etag := header.Get("ETag"); etag != "" {
 		fileInfo.ETag = strings.Trim(etag, `"`)
 	}
 
-	if lastModified := resp.Header().Get("Last-Modified"); lastModified != "" {
+	if lastModified := header.Get("Last-Modified"); lastModified != "" {
 		if t, err := time.Parse(time.RFC1123, lastModified); err == nil {
 			fileInfo.LastModified = &t
 		}
 	}
 
-	return fileInfo, nil
+	return fileInfo
 }
 
 func (h *HTTPClient) DownloadChunk(ctx context.Context, urlStr string, chunk ChunkInfo, options *DownloadOptions) ([]byte, error) {
-	req := h.client.R().SetContext(ctx)
+	var data []byte
+	err := h.fetchRange(ctx, urlStr, &chunk, remoteFile{}, options, func(body io.Reader) (int64, error) {
+		buf := bytes.NewBuffer(make([]byte, 0, chunk.Size))
+		n, err := io.Copy(buf, body)
+		data = buf.Bytes()
+		return n, err
+	})
+	if err != nil {
+		return nil, err
+	}
+	return data, nil
+}
+
+// fetchRange requests a byte range with retries and hands the response body
+// to consume, which reports how many bytes it took from it. consume may
+// shrink *chunk to the part it has not stored yet; a retry then only
+// requests what is left. Each reply is checked against want; a mismatch, or
+// a server that stopped honouring ranges, fails with errFileInfoStale
+// without retrying.
+func (h *HTTPClient) fetchRange(ctx context.Context, urlStr string, chunk *ChunkInfo, want remoteFile, options *DownloadOptions, consume func(body io.Reader) (int64, error)) error {
+	req := h.transfer.R().SetDoNotParseResponse(true)
 
 	if options != nil && options.Headers != nil {
 		req.SetHeaders(options.Headers)
 	}
 
-	rangeHeader := fmt.Sprintf("bytes=%d-%d", chunk.Start, chunk.End)
-	req.SetHeader("Range", rangeHeader)
-
 	maxRetries := 3
 	retryDelay := 2 * time.Second
 	if options != nil {
@@ -143,117 +337,838 @@ func (h *HTTPClient) DownloadChunk(ctx context.Context, urlStr string, chunk Chu
 
 			select {
 			case <-ctx.Done():
-				return nil, ctx.Err()
+				return ctx.Err()
 			case <-time.After(retryDelay):
 			}
 		}
 
-		resp, err := req.Get(urlStr)
-		if err != nil {
-			lastErr = fmt.Errorf("HTTP request failed: %w", err)
-			continue
+		req.SetHeader("Range", rangeHeader(chunk.Start, chunk.End))
+
+		retry, err := fetchRangeOnce(ctx, req, urlStr, *chunk, want, stallTimeout(options), consume)
+		if err == nil {
+			return nil
+		}
+		if !retry {
+			return err
 		}
+		lastErr = err
+	}
 
-		if resp.StatusCode() != http.StatusPartialContent && resp.StatusCode() != http.StatusOK {
-			lastErr = fmt.Errorf("unexpected status code: %d", resp.StatusCode())
-			continue
+	return fmt.Errorf("failed to download chunk after %d attempts: %w", maxRetries+1, lastErr)
+}
+
+// fetchRangeOnce makes a single attempt at a range request, abandoning it
+// if the reply stalls for longer than stall. It reports whether a failure
+// is worth retrying.
+func fetchRangeOnce(ctx context.Context, req *resty.Request, urlStr string, chunk ChunkInfo, want remoteFile, stall time.Duration, consume func(body io.Reader) (int64, error)) (bool, error) {
+	ctx, cancel := context.WithCancel(ctx)
+	defer cancel()
+	timer := newStallTimer(cancel, stall)
+	defer timer.stop()
+
+	resp, err := req.SetContext(ctx).Get(urlStr)
+	if err != nil {
+		return true, fmt.Errorf("HTTP request failed: %w", timer.wrap(err))
+	}
+	body := resp.RawBody()
+
+	if err := want.check(resp.StatusCode(), resp.Header()); err != nil {
+		body.Close()
+		return false, err
+	}
+
+	// The whole file in reply to a later range means ranges are no
+	// longer supported; retrying will not change that
+	if want.size > 0 && resp.StatusCode() == http.StatusOK && chunk.Start != 0 {
+		body.Close()
+		return false, fmt.Errorf("%w: server ignored the range request", errFileInfoStale)
+	}
+
+	err = consumeRange(resp.StatusCode(), body, chunk, func(body io.Reader) (int64, error) {
+		return consume(timer.reader(body))
+	})
+	return true, timer.wrap(err)
+}
+
+// defaultStallTimeout is how long a download request may go without
+// receiving data when DownloadOptions.Timeout is not set
+const defaultStallTimeout = 30 * time.Second
+
+func stallTimeout(options *DownloadOptions) time.Duration {
+	if options != nil && options.Timeout > 0 {
+		return options.Timeout
+	}
+	return defaultStallTimeout
+}
+
+// stallTimer cancels a request once its reply stops arriving, whether
+// waiting for the headers or between reads of the body. Unlike a limit on
+// the whole request, it lets a slow but steady transfer run to the end.
+type stallTimer struct {
+	timer   *time.Timer
+	timeout time.Duration
+	stalled atomic.Bool
+}
+
+func newStallTimer(cancel context.CancelFunc, timeout time.Duration) *stallTimer {
+	t := &stallTimer{timeout: timeout}
+	t.timer = time.AfterFunc(timeout, func() {
+		t.stalled.Store(true)
+		cancel()
+	})
+	return t
+}
+
+// reader returns r with every read that delivers data pushing the
+// deadline back
+func (t *stallTimer) reader(r io.Reader) io.Reader {
+	return &stallReader{r: r, timer: t}
+}
+
+func (t *stallTimer) stop() {
+	t.timer.Stop()
+}
+
+// wrap explains err if it came from the timer cancelling the request
+func (t *stallTimer) wrap(err error) error {
+	if err != nil && t.stalled.Load() {
+		return fmt.Errorf("no data received for %v: %w", t.timeout, err)
+	}
+	return err
+}
+
+type stallReader struct {
+	r     io.Reader
+	timer *stallTimer
+}
+
+func (r *stallReader) Read(p []byte) (int, error) {
+	n, err := r.r.Read(p)
+	if n > 0 {
+		r.timer.timer.Reset(r.timer.timeout)
+	}
+	return n, err
+}
+
+// rangeHeader formats a Range header value for the inclusive byte range
+// start-end without going through fmt
+func rangeHeader(start, end int64) string {
+	buf := make([]byte, 0, len("bytes=-")+2*20)
+	buf = append(buf, "bytes="...)
+	buf = strconv.AppendInt(buf, start, 10)
+	buf = append(buf, '-')
+	buf = strconv.AppendInt(buf, end, 10)
+	return string(buf)
+}
+
+// errFileInfoStale reports that the server no longer serves the file the
+// download was planned with: its size changed or it stopped honouring ranges
+var errFileInfoStale = errors.New("remote file changed")
+
+// reportedSize returns the full size of the remote file as reported by
+// Content-Range on a 206 or Content-Length on a 200, if the server says
+func reportedSize(statusCode int, header http.Header) (int64, bool) {
+	var reported string
+	switch statusCode {
+	case http.StatusPartialContent:
+		contentRange := header.Get("Content-Range")
+		i := strings.LastIndexByte(contentRange, '/')
+		if i < 0 {
+			return 0, false
 		}
+		reported = contentRange[i+1:]
+	case http.StatusOK:
+		reported = header.Get("Content-Length")
+	}
 
-		body := resp.Body()
-		if int64(len(body)) != chunk.Size {
-			lastErr = fmt.Errorf("received %d bytes, expected %d bytes", len(body), chunk.Size)
-			continue
+	size, err := strconv.ParseInt(reported, 10, 64)
+	if err != nil {
+		return 0, false
+	}
+	return size, true
+}
+
+// checkTotalSize compares the full size of the remote file, as reported by
+// Content-Range on a 206 or Content-Length on a 200, with expected. Sizes
+// the server does not report are not checked, nor is a zero expected.
+func checkTotalSize(statusCode int, header http.Header, expected int64) error {
+	if expected <= 0 {
+		return nil
+	}
+
+	size, ok := reportedSize(statusCode, header)
+	if ok && size != expected {
+		return fmt.Errorf("%w: expected %d bytes, server reports %d", errFileInfoStale, expected, size)
+	}
+	return nil
+}
+
+// remoteFile is what a download expects the server to be serving
+type remoteFile struct {
+	// size is checked when non-zero
+	size int64
+	// etag and lastModified are checked when set. They are only set for
+	// file info from the cache, which may predate a change to the file.
+	etag         string
+	lastModified *time.Time
+}
+
+// expectFile returns what replies for the file described by fileInfo are
+// checked against
+func expectFile(fileInfo *FileInfo, cached bool) remoteFile {
+	want := remoteFile{size: fileInfo.Size}
+	if cached {
+		want.etag = fileInfo.ETag
+		want.lastModified = fileInfo.LastModified
+	}
+	return want
+}
+
+// check fails with errFileInfoStale if a reply shows the remote file is not
+// the one expected. Values the server leaves out are not checked.
+func (f remoteFile) check(statusCode int, header http.Header) error {
+	if err := checkTotalSize(statusCode, header, f.size); err != nil {
+		return err
+	}
+
+	if f.etag != "" {
+		if etag := strings.Trim(header.Get("ETag"), `"`); etag != "" && etag != f.etag {
+			return fmt.Errorf("%w: ETag changed from %q to %q", errFileInfoStale, f.etag, etag)
+		}
+	}
+
+	if f.lastModified != nil {
+		if t, err := time.Parse(time.RFC1123, header.Get("Last-Modified")); err == nil && !t.Equal(*f.lastModified) {
+			return fmt.Errorf("%w: last modified %s, server reports %s", errFileInfoStale,
+				f.lastModified.Format(time.RFC1123), t.Format(time.RFC1123))
 		}
+	}
+
+	return nil
+}
+
+func consumeRange(statusCode int, body io.ReadCloser, chunk ChunkInfo, consume func(body io.Reader) (int64, error)) error {
+	defer body.Close()
+
+	// A plain 200 carries the file from its first byte, which is only the
+	// requested range when that range starts at zero
+	if statusCode != http.StatusPartialContent && (statusCode != http.StatusOK || chunk.Start != 0) {
+		return fmt.Errorf("unexpected status code: %d", statusCode)
+	}
+
+	n, err := consume(io.LimitReader(body, chunk.Size+1))
+	if err != nil {
+		return fmt.Errorf("failed to read chunk body: %w", err)
+	}
 
-		return body, nil
+	if n != chunk.Size {
+		return fmt.Errorf("received %d bytes, expected %d bytes", n, chunk.Size)
 	}
 
-	return nil, fmt.Errorf("failed to download chunk after %d attempts: %w", maxRetries+1, lastErr)
+	return nil
 }
 
 func (h *HTTPClient) DownloadToFile(ctx context.Context, urlStr, filename string, options *DownloadOptions) error {
+	var cache *FileInfoCache
+	if options != nil {
+		cache = options.FileInfoCache
+	}
+
+	fileInfo := cache.Load(urlStr)
+	cached := fileInfo != nil
+	if cached {
+		h.logger.Debugf("Using cached file info for %s", urlStr)
+	} else {
+		var err error
+		if fileInfo, err = h.fetchFileInfo(ctx, urlStr, cache, options); err != nil {
+			return err
+		}
+	}
+
+	err := h.download(ctx, urlStr, filename, fileInfo, cached, options)
+	if cached && errors.Is(err, errFileInfoStale) {
+		// The file changed since it was cached; start over with fresh info
+		h.logger.Info("Remote file changed since it was last seen, refreshing file info")
+		if err := cache.Clear(urlStr); err != nil {
+			h.logger.Warnf("Failed to clear file info cache: %v", err)
+		}
+
+		// Nothing the first attempt hashed or recorded belongs to the new file
+		if options.Hasher != nil {
+			options.Hasher.Reset()
+		}
+		if options.ResumeManager != nil {
+			if err := options.ResumeManager.ClearProgress(resumeKey(urlStr, options)); err != nil {
+				h.logger.Warnf("Failed to clear resume data: %v", err)
+			}
+		}
+		if options.ResumeFunc != nil {
+			options.ResumeFunc(0, 0)
+		}
+
+		if fileInfo, err = h.fetchFileInfo(ctx, urlStr, cache, options); err != nil {
+			return err
+		}
+		err = h.download(ctx, urlStr, filename, fileInfo, false, options)
+	}
+
+	return err
+}
+
+// fetchFileInfo sends the HEAD request for urlStr and caches the result
+func (h *HTTPClient) fetchFileInfo(ctx context.Context, urlStr string, cache *FileInfoCache, options *DownloadOptions) (*FileInfo, error) {
 	fileInfo, err := h.GetFileInfo(ctx, urlStr, options.Headers)
 	if err != nil {
-		return fmt.Errorf("failed to get file info: %w", err)
+		return nil, fmt.Errorf("failed to get file info: %w", err)
 	}
 
-	if fileInfo.Size == 0 {
-		return h.downloadSimple(ctx, urlStr, filename, options)
+	if err := cache.Save(urlStr, fileInfo); err != nil {
+		h.logger.Warnf("Failed to cache file info: %v", err)
 	}
 
-	if !fileInfo.SupportsRangeRequests {
-		h.logger.Warn("Server doesn't support range requests, falling back to simple download")
-		return h.downloadSimple(ctx, urlStr, filename, options)
+	return fileInfo, nil
+}
+
+// download fetches the file described by fileInfo; cached says whether
+// fileInfo came from the cache
+func (h *HTTPClient) download(ctx context.Context, urlStr, filename string, fileInfo *FileInfo, cached bool, options *DownloadOptions) error {
+	if fileInfo.Size == 0 || !fileInfo.SupportsRangeRequests {
+		if fileInfo.Size != 0 {
+			h.logger.Warn("Server doesn't support range requests, falling back to simple download")
+		}
+		return h.downloadSimple(ctx, urlStr, filename, expectFile(fileInfo, cached), options)
 	}
 
-	chunkSize := int64(1024 * 1024) // 1MB default
+	var chunkSize int64
 	if options != nil && options.ChunkSize > 0 {
 		chunkSize = options.ChunkSize
+	} else if saved := savedChunkSize(urlStr, filename, fileInfo, options); saved > 0 {
+		// Keep the layout of an interrupted download so its chunks still count
+		chunkSize = saved
+	} else {
+		connections := defaultMaxConnections
+		if options != nil && options.MaxConnections > 0 {
+			connections = options.MaxConnections
+		}
+		chunkSize = chunkSizeFor(fileInfo.Size, connections)
 	}
 
-	return h.downloadChunked(ctx, urlStr, filename, fileInfo.Size, chunkSize, options)
+	return h.downloadChunked(ctx, urlStr, filename, fileInfo, cached, chunkSize, options)
 }
 
-func (h *HTTPClient) downloadSimple(ctx context.Context, urlStr, filename string, options *DownloadOptions) error {
-	req := h.client.R().SetContext(ctx)
+// chunkSizeFor picks a chunk size that gives each of connections about
+// chunksPerConnection chunks of a totalSize file, clamped to 1MB-16MB. Small
+// files get few chunks instead of dozens of sub-RTT ones, and large files
+// get chunks big enough to amortise their bookkeeping. The result is a
+// multiple of directIOAlignment.
+func chunkSizeFor(totalSize int64, connections int) int64 {
+	if connections < 1 {
+		connections = 1
+	}
+
+	size := totalSize / int64(connections*chunksPerConnection)
+	if size < minAutoChunkSize {
+		return minAutoChunkSize
+	}
+	if size > maxAutoChunkSize {
+		return maxAutoChunkSize
+	}
+	// Keep chunks block aligned so direct I/O stays usable
+	return size &^ (directIOAlignment - 1)
+}
+
+// rangeSizeFor picks the default range request size: the same split by
+// connection as chunkSizeFor, kept between 16MB and 32MB, so large files
+// need fewer requests while each connection still gets several. It never
+// exceeds each connection's share of the file, so that smaller files still
+// spread over every connection.
+func rangeSizeFor(totalSize int64, connections int) int64 {
+	if connections < 1 {
+		connections = 1
+	}
+
+	size := totalSize / int64(connections*chunksPerConnection)
+	if size < defaultRangeSize {
+		size = defaultRangeSize
+	}
+	if size > maxAutoRangeSize {
+		size = maxAutoRangeSize
+	}
+
+	if share := (totalSize + int64(connections) - 1) / int64(connections); size > share {
+		size = share
+	}
+	return size
+}
+
+// downloadSimple fetches urlStr with a single GET. The response is checked
+// against want before anything is written.
+func (h *HTTPClient) downloadSimple(ctx context.Context, urlStr, filename string, want remoteFile, options *DownloadOptions) error {
+	ctx, cancel := context.WithCancel(ctx)
+	defer cancel()
+	timer := newStallTimer(cancel, stallTimeout(options))
+	defer timer.stop()
+
+	req := h.transfer.R().SetContext(ctx).SetDoNotParseResponse(true)
 
 	if options != nil && options.Headers != nil {
 		req.SetHeaders(options.Headers)
 	}
 
+	resp, err := req.Get(urlStr)
+	if err != nil {
+		return fmt.Errorf("download failed: %w", timer.wrap(err))
+	}
+	body := resp.RawBody()
+	defer body.Close()
+
+	if resp.StatusCode() != http.StatusOK {
+		return fmt.Errorf("unexpected status code: %d", resp.StatusCode())
+	}
+
+	if err := want.check(resp.StatusCode(), resp.Header()); err != nil {
+		return err
+	}
+
 	file, err := os.Create(filename)
 	if err != nil {
 		return fmt.Errorf("failed to create file: %w", err)
 	}
 	defer file.Close()
 
-	resp, err := req.SetOutput(filename).Get(urlStr)
-	if err != nil {
-		return fmt.Errorf("download failed: %w", err)
+	// Hash the body while it streams to disk rather than re-reading the file
+	var dst io.Writer = file
+	if options != nil && options.Hasher != nil {
+		dst = io.MultiWriter(file, options.Hasher)
 	}
 
-	if resp.StatusCode() != http.StatusOK {
-		return fmt.Errorf("unexpected status code: %d", resp.StatusCode())
+	if _, err := copyPipelined(dst, timer.reader(body)); err != nil {
+		return fmt.Errorf("failed to write file: %w", timer.wrap(err))
 	}
 
 	return nil
 }
 
-func (h *HTTPClient) downloadChunked(ctx context.Context, urlStr, filename string, totalSize, chunkSize int64, options *DownloadOptions) error {
-	file, err := os.Create(filename)
+// copyPipelined copies src to dst like io.Copy, but writes on a dedicated
+// goroutine so the network read of the next buffer overlaps the disk write
+// of the previous one. Writes stay in order.
+func copyPipelined(dst io.Writer, src io.Reader) (int64, error) {
+	free := make(chan []byte, pipelineDepth)
+	for i := 0; i < pipelineDepth; i++ {
+		free <- make([]byte, simpleBufferSize)
+	}
+
+	filled := make(chan []byte, pipelineDepth)
+	stop := make(chan struct{})
+
+	var (
+		written  int64
+		writeErr error
+	)
+	writerDone := make(chan struct{})
+
+	go func() {
+		defer close(writerDone)
+		for buf := range filled {
+			if writeErr == nil {
+				n, err := dst.Write(buf)
+				written += int64(n)
+				if err == nil && n != len(buf) {
+					err = io.ErrShortWrite
+				}
+				if err != nil {
+					writeErr = err
+					close(stop)
+				}
+			}
+			free <- buf[:cap(buf)]
+		}
+	}()
+
+	var readErr error
+read:
+	for {
+		var buf []byte
+		select {
+		case buf = <-free:
+		case <-stop:
+			break read
+		}
+
+		n, err := src.Read(buf)
+		if n > 0 {
+			filled <- buf[:n]
+		} else {
+			free <- buf
+		}
+
+		if err == io.EOF {
+			break
+		}
+		if err != nil {
+			readErr = err
+			break
+		}
+	}
+
+	close(filled)
+	<-writerDone
+
+	if writeErr != nil {
+		return written, writeErr
+	}
+	return written, readErr
+}
+
+func (h *HTTPClient) downloadChunked(ctx context.Context, urlStr, filename string, fileInfo *FileInfo, cached bool, chunkSize int64, options *DownloadOptions) error {
+	totalSize := fileInfo.Size
+	want := expectFile(fileInfo, cached)
+	chunks := calculateChunks(totalSize, chunkSize)
+
+	var tracker *resumeTracker
+	if options != nil && options.ResumeManager != nil {
+		tracker = newResumeTracker(options.ResumeManager, resumeKey(urlStr, options), filename, fileInfo.validator(), totalSize, chunkSize, len(chunks))
+	}
+
+	// Keep the existing bytes when resuming; otherwise start from scratch
+	flags := os.O_RDWR | os.O_CREATE
+	if tracker.completedCount() == 0 {
+		flags |= os.O_TRUNC
+	} else {
+		h.logger.Infof("Resuming download: %d of %d chunks already on disk",
+			tracker.completedCount(), len(chunks))
+	}
+
+	if options != nil && options.ResumeFunc != nil {
+		options.ResumeFunc(tracker.completedCount(), len(chunks))
+	}
+
+	file, err := os.OpenFile(filename, flags, 0644)
 	if err != nil {
 		return fmt.Errorf("failed to create file: %w", err)
 	}
 	defer file.Close()
 
-	chunks := calculateChunks(totalSize, chunkSize)
+	// Size the file up front so every chunk can be written at its final
+	// offset as soon as it arrives instead of being held in memory
+	allocStart := time.Now()
+	if err := preallocate(file, totalSize); err != nil {
+		return fmt.Errorf("failed to allocate file: %w", err)
+	}
+	if h.logger.IsLevelEnabled(logrus.DebugLevel) {
+		h.logger.Debugf("Allocated %s in %v", FormatBytes(totalSize), time.Since(allocStart))
+	}
+
+	// Chunk data can bypass the page cache; everything else, including
+	// reads for hashing and any unaligned tail, uses the regular descriptor
+	var direct *os.File
+	if options != nil && options.DirectIO {
+		if direct = h.openDirectIO(filename, chunkSize); direct != nil {
+			defer direct.Close()
+		}
+	}
+
+	maxConnections := defaultMaxConnections
+	if options != nil && options.MaxConnections > 0 {
+		maxConnections = options.MaxConnections
+	}
+
+	// Each request covers several adjacent chunks to cut per-request
+	// overhead; chunks stay the unit for progress, hashing and resume
+	rangeSize := rangeSizeFor(totalSize, maxConnections)
+	if options != nil && options.RangeSize > 0 {
+		rangeSize = options.RangeSize
+	}
+	chunksPerRange := int(rangeSize / chunkSize)
+	if chunksPerRange < 1 {
+		chunksPerRange = 1
+	}
+
+	if h.logger.IsLevelEnabled(logrus.DebugLevel) {
+		h.logger.Debugf("Downloading %s as %d chunks of %s, %s per request, over %d connections",
+			FormatBytes(totalSize), len(chunks), FormatBytes(chunkSize),
+			FormatBytes(int64(chunksPerRange)*chunkSize), maxConnections)
+	}
+
+	ctx, cancel := context.WithCancel(ctx)
+	defer cancel()
+
+	var (
+		wg         sync.WaitGroup
+		errOnce    sync.Once
+		firstErr   error
+		downloaded int64
+	)
+
+	fail := func(err error) {
+		errOnce.Do(func() {
+			firstErr = err
+			cancel()
+		})
+	}
+
+	// Hash finished chunks in file order while the remaining ones are
+	// still downloading, straight from memory where possible
+	var (
+		hasher  *orderedHasher
+		hashErr chan error
+	)
+	if options != nil && options.Hasher != nil {
+		hasher = newOrderedHasher(options.Hasher, file, chunks, chunkSize)
+		hashErr = make(chan error, 1)
+		go func() {
+			err := hasher.run()
+			if err != nil {
+				fail(fmt.Errorf("failed to hash downloaded file: %w", err))
+			}
+			hashErr <- err
+		}()
+	}
+
+	// Chunks already on disk are read back by the hasher
+	for i, chunk := range chunks {
+		if tracker.isCompleted(i) {
+			hasher.add(i, nil)
+			downloaded += chunk.Size
+		}
+	}
+
+	finish := func(i int, data *bytes.Buffer) {
+		chunk := chunks[i]
+		if err := tracker.markCompleted(file, i, chunk.Size); err != nil {
+			h.logger.Warnf("Failed to save resume data: %v", err)
+		}
+
+		hasher.add(i, data)
+		atomic.AddInt64(&downloaded, chunk.Size)
+	}
+
+	// Workers only bump the counter; a single goroutine reports progress
+	// at a fixed rate
+	progressStop := make(chan struct{})
+	progressDone := make(chan struct{})
+	if options != nil && options.ProgressFunc != nil {
+		go func() {
+			defer close(progressDone)
+			reportProgress(progressStop, &downloaded, totalSize, options.ProgressFunc)
+		}()
+	} else {
+		close(progressDone)
+	}
+
+	// A fixed pool of maxConnections workers pulls ranges of chunks off a
+	// channel, so the goroutine count stays bounded however many chunks
+	// the file has. Each range streams straight into the file.
+	jobs := make(chan chunkRange)
+	if maxConnections > len(chunks) {
+		maxConnections = len(chunks)
+	}
+
+	// retire asks one worker to exit when the tuner backs off
+	retire := make(chan struct{}, max(tunerMaxConnections, maxConnections))
+
+	// The tuner samples bytes as they arrive; downloaded only moves when a
+	// whole chunk is done, which at large chunk sizes is too coarse
+	var transferred *int64
+	if options != nil && options.AdaptiveConnections {
+		transferred = new(int64)
+	}
+
+	startWorker := func() {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+
+			// One set of buffers per worker, reused for every range it downloads
+			worker := &rangeWorker{buf: make([]byte, copyBufferSize), transferred: transferred}
+			if direct != nil {
+				worker.direct = newDirectChunkWriter(direct, file)
+			}
+
+			for {
+				var job chunkRange
+				select {
+				case <-retire:
+					return
+				case next, ok := <-jobs:
+					if !ok {
+						return
+					}
+					job = next
+				}
+
+				if err := h.streamRange(ctx, urlStr, chunks, job, want, file, worker, hasher, options, finish); err != nil {
+					fail(fmt.Errorf("failed to download chunk %d-%d: %w",
+						chunks[job.first].Start, chunks[job.last].End, err))
+					return
+				}
+			}
+		}()
+	}
+
+	for w := 0; w < maxConnections; w++ {
+		startWorker()
+	}
+
+	// With adaptive connections, MaxConnections is only the starting point
+	dispatched := make(chan struct{})
+	if options != nil && options.AdaptiveConnections {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			workers := tuneConnections(ctx, dispatched, transferred, maxConnections, startWorker, retire)
+			h.logger.Debugf("Connection tuner settled on %d connections", workers)
+		}()
+	}
+
+dispatch:
+	for i := 0; i < len(chunks); {
+		if tracker.isCompleted(i) {
+			i++
+			continue
+		}
+
+		// Extend the range over following chunks that still need fetching
+		job := chunkRange{first: i, last: i}
+		for job.last+1 < len(chunks) && job.last-job.first+1 < chunksPerRange && !tracker.isCompleted(job.last+1) {
+			job.last++
+		}
+		i = job.last + 1
 
-	// Download chunks sequentially for now
-	// TODO: Implement parallel downloading with worker pool
-	var downloaded int64
-	for _, chunk := range chunks {
 		select {
+		case jobs <- job:
 		case <-ctx.Done():
-			return ctx.Err()
-		default:
+			break dispatch
 		}
+	}
+	close(jobs)
+	close(dispatched)
 
-		data, err := h.DownloadChunk(ctx, urlStr, chunk, options)
-		if err != nil {
-			return fmt.Errorf("failed to download chunk %d-%d: %w", chunk.Start, chunk.End, err)
+	wg.Wait()
+
+	close(progressStop)
+	<-progressDone
+
+	if hasher != nil {
+		hasher.close()
+		<-hashErr
+	}
+
+	if firstErr == nil {
+		firstErr = ctx.Err()
+	}
+
+	if firstErr != nil {
+		// Record everything that made it to disk so the next run resumes
+		if err := tracker.save(file); err != nil {
+			h.logger.Warnf("Failed to save resume data: %v", err)
 		}
+		return firstErr
+	}
+
+	if err := tracker.clear(); err != nil {
+		h.logger.Warnf("Failed to clear resume data: %v", err)
+	}
+
+	return nil
+}
+
+// progressInterval is how often chunked downloads report progress
+const progressInterval = 100 * time.Millisecond
 
-		if _, err := file.WriteAt(data, chunk.Start); err != nil {
-			return fmt.Errorf("failed to write chunk to file: %w", err)
+// reportProgress calls fn with the value of downloaded every
+// progressInterval while it changes, and once more when stop is closed
+func reportProgress(stop <-chan struct{}, downloaded *int64, total int64, fn func(downloaded, total int64)) {
+	ticker := time.NewTicker(progressInterval)
+	defer ticker.Stop()
+
+	reported := int64(-1)
+	report := func() {
+		if current := atomic.LoadInt64(downloaded); current != reported {
+			reported = current
+			fn(current, total)
 		}
+	}
 
-		downloaded += chunk.Size
-		if options != nil && options.ProgressFunc != nil {
-			options.ProgressFunc(downloaded, totalSize)
+	for {
+		select {
+		case <-ticker.C:
+			report()
+		case <-stop:
+			report()
+			return
 		}
 	}
+}
 
-	return nil
+// chunkRange is a run of adjacent chunks fetched with a single request
+type chunkRange struct {
+	first, last int
+}
+
+// rangeWorker holds the buffers a chunk worker reuses across ranges
+type rangeWorker struct {
+	// buf is the copy buffer; neither side of the copy bypasses it
+	buf []byte
+	// direct, if set, writes chunks through an O_DIRECT descriptor
+	direct *directChunkWriter
+	// transferred, if set, counts every byte received
+	transferred *int64
+}
+
+// streamRange downloads chunks[job.first..job.last] with one range request,
+// storing each chunk at its offset and calling finish as each one lands.
+// Chunks the hasher wants are also captured in memory and passed to finish.
+// Replies are checked against want.
+func (h *HTTPClient) streamRange(ctx context.Context, urlStr string, chunks []ChunkInfo, job chunkRange, want remoteFile, dst io.WriterAt, worker *rangeWorker, hasher *orderedHasher, options *DownloadOptions, finish func(i int, data *bytes.Buffer)) error {
+	span := ChunkInfo{
+		Start: chunks[job.first].Start,
+		End:   chunks[job.last].End,
+	}
+	span.Size = span.End - span.Start + 1
+
+	next := job.first
+	return h.fetchRange(ctx, urlStr, &span, want, options, func(body io.Reader) (int64, error) {
+		if worker.transferred != nil {
+			body = &countingReader{r: body, n: worker.transferred}
+		}
+
+		var n int64
+		for next <= job.last {
+			chunk := chunks[next]
+
+			var w io.Writer = io.NewOffsetWriter(dst, chunk.Start)
+			if worker.direct != nil {
+				worker.direct.reset(chunk.Start)
+				w = worker.direct
+			}
+
+			data := hasher.capture(next)
+			if data != nil {
+				w = io.MultiWriter(w, data)
+			}
+
+			written, err := io.CopyBuffer(w, io.LimitReader(body, chunk.Size), worker.buf)
+			n += written
+			if err != nil || written != chunk.Size {
+				return n, err
+			}
+
+			if worker.direct != nil {
+				if err := worker.direct.flush(); err != nil {
+					return n, err
+				}
+			}
+
+			finish(next, data)
+			next++
+
+			// A retry only needs to fetch the chunks that follow
+			span.Start = chunk.End + 1
+			span.Size -= chunk.Size
+		}
+		return n, nil
+	})
 }
 
 func calculateChunks(totalSize, chunkSize int64) []ChunkInfo {
@@ -275,20 +1190,29 @@ func calculateChunks(totalSize, chunkSize int64) []ChunkInfo {
 	return chunks
 }
 
+var (
+	filenamePattern     = regexp.MustCompile(`filename="?([^";\r\n]+)"?`)
+	filenameUTF8Pattern = regexp.MustCompile(`filename\*=UTF-8''([^;\r\n]+)`)
+)
+
 func extractFilename(contentDisposition string) string {
 	// Try to extract filename from Content-Disposition header
 	// Format: attachment; filename="filename.ext" or filename*=UTF-8''filename.ext
 
-	// First try the standard filename parameter
-	re := regexp.MustCompile(`filename="?([^";\r\n]+)"?`)
-	matches := re.FindStringSubmatch(contentDisposition)
+	// Well-formed headers parse in one pass, with filename* already decoded
+	if _, params, err := mime.ParseMediaType(contentDisposition); err == nil {
+		return strings.TrimSpace(params["filename"])
+	}
+
+	// Servers often send malformed headers, such as unquoted names with
+	// spaces, so fall back to matching the parameters directly
+	matches := filenamePattern.FindStringSubmatch(contentDisposition)
 	if len(matches) > 1 {
 		return strings.TrimSpace(matches[1])
 	}
 
 	// Try filename* for UTF-8 encoded filenames
-	re = regexp.MustCompile(`filename\*=UTF-8''([^;\r\n]+)`)
-	matches = re.FindStringSubmatch(contentDisposition)
+	matches = filenameUTF8Pattern.FindStringSubmatch(contentDisposition)
 	if len(matches) > 1 {
 		// URL decode the filename
 		if decoded, err := url.QueryUnescape(matches[1]); err == nil {
@@ -310,6 +1234,26 @@ type FileInfo struct {
 	SupportsRangeRequests bool
 }
 
+// resumeKey is the key the resume data of a download of urlStr is saved under
+func resumeKey(urlStr string, options *DownloadOptions) string {
+	if options.ResumeKey != "" {
+		return options.ResumeKey
+	}
+	return urlStr
+}
+
+// validator returns the ETag of the file, or its Last-Modified date when it
+// has none, for telling versions of the file apart
+func (f *FileInfo) validator() string {
+	if f.ETag != "" {
+		return f.ETag
+	}
+	if f.LastModified != nil {
+		return f.LastModified.UTC().Format(http.TimeFormat)
+	}
+	return ""
+}
+
 // FormatBytes formats bytes for display
 func FormatBytes(bytes int64) string {
 	const unit = 1024
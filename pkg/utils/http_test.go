@@ -1,15 +1,21 @@
 package utils
 
 import (
+	"bytes"
 	"context"
+	"crypto/sha256"
 	"fmt"
 	"net/http"
 	"net/http/httptest"
 	"os"
 	"path/filepath"
+	"strconv"
 	"strings"
+	"sync"
 	"testing"
 	"time"
+
+	"github.com/milindmadhukar/cloudget/pkg/interfaces"
 )
 
 func TestNewHTTPClient(t *testing.T) {
@@ -25,6 +31,31 @@ func TestNewHTTPClient(t *testing.T) {
 	}
 }
 
+func TestHTTPClient_Client(t *testing.T) {
+	client := NewHTTPClient()
+	transport := client.client.GetClient().Transport
+
+	for name, c := range map[string]*http.Client{
+		"Client":           client.Client(),
+		"NoRedirectClient": client.NoRedirectClient(),
+	} {
+		if c.Transport != transport {
+			t.Errorf("%s does not share the connection pool", name)
+		}
+		// Service requests may carry whole transfers, so no overall timeout
+		if c.Timeout != 0 {
+			t.Errorf("%s has timeout %v, want none", name, c.Timeout)
+		}
+		if c.Jar != nil {
+			t.Errorf("%s keeps cookies", name)
+		}
+	}
+
+	if err := client.NoRedirectClient().CheckRedirect(nil, nil); err != http.ErrUseLastResponse {
+		t.Errorf("NoRedirectClient follows redirects: CheckRedirect returned %v", err)
+	}
+}
+
 func TestHTTPClient_GetFileInfo(t *testing.T) {
 	tests := []struct {
 		name           string
@@ -111,6 +142,68 @@ func TestHTTPClient_GetFileInfo(t *testing.T) {
 	}
 }
 
+func TestHTTPClient_GetFileInfo_RangeProbe(t *testing.T) {
+	content := bytes.Repeat([]byte("x"), 5000)
+
+	tests := []struct {
+		name         string
+		handler      http.HandlerFunc
+		expectRanges bool
+	}{
+		{
+			name: "HEAD rejected but ranges served",
+			handler: func(w http.ResponseWriter, r *http.Request) {
+				if r.Method == http.MethodHead {
+					w.WriteHeader(http.StatusMethodNotAllowed)
+					return
+				}
+				http.ServeContent(w, r, "data.bin", time.Time{}, bytes.NewReader(content))
+			},
+			expectRanges: true,
+		},
+		{
+			name: "Accept-Ranges missing from HEAD",
+			handler: func(w http.ResponseWriter, r *http.Request) {
+				if r.Method == http.MethodHead {
+					w.Header().Set("Content-Length", fmt.Sprintf("%d", len(content)))
+					return
+				}
+				http.ServeContent(w, r, "data.bin", time.Time{}, bytes.NewReader(content))
+			},
+			expectRanges: true,
+		},
+		{
+			name: "range request answered in full",
+			handler: func(w http.ResponseWriter, r *http.Request) {
+				w.Header().Set("Content-Length", fmt.Sprintf("%d", len(content)))
+				if r.Method == http.MethodGet {
+					w.Write(content)
+				}
+			},
+			expectRanges: false,
+		},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			server := httptest.NewServer(tt.handler)
+			defer server.Close()
+
+			fileInfo, err := NewHTTPClient().GetFileInfo(context.Background(), server.URL+"/data.bin", nil)
+			if err != nil {
+				t.Fatalf("Unexpected error: %v", err)
+			}
+
+			if fileInfo.Size != int64(len(content)) {
+				t.Errorf("Expected size %d, got %d", len(content), fileInfo.Size)
+			}
+			if fileInfo.SupportsRangeRequests != tt.expectRanges {
+				t.Errorf("Expected SupportsRangeRequests %v, got %v", tt.expectRanges, fileInfo.SupportsRangeRequests)
+			}
+		})
+	}
+}
+
 func TestHTTPClient_DownloadChunk(t *testing.T) {
 	testData := "Hello, World! This is test data for chunk download."
 
@@ -390,3 +483,663 @@ func TestHTTPClientWithContext(t *testing.T) {
 		t.Errorf("Expected context deadline exceeded error, got: %v", err)
 	}
 }
+
+func TestHTTPClient_DownloadToFile_Parallel(t *testing.T) {
+	content := make([]byte, 64*1024+123)
+	for i := range content {
+		content[i] = byte(i % 251)
+	}
+
+	var mu sync.Mutex
+	rangeRequests := 0
+
+	server := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		if r.Header.Get("Range") != "" {
+			mu.Lock()
+			rangeRequests++
+			mu.Unlock()
+		}
+		http.ServeContent(w, r, "data.bin", time.Time{}, bytes.NewReader(content))
+	}))
+	defer server.Close()
+
+	client := NewHTTPClient()
+	filename := filepath.Join(t.TempDir(), "data.bin")
+
+	options := &DownloadOptions{
+		ChunkSize:      4096,
+		RangeSize:      3 * 4096,
+		MaxConnections: 4,
+		RetryDelay:     10 * time.Millisecond,
+	}
+
+	if err := client.DownloadToFile(context.Background(), server.URL, filename, options); err != nil {
+		t.Fatalf("DownloadToFile failed: %v", err)
+	}
+
+	downloaded, err := os.ReadFile(filename)
+	if err != nil {
+		t.Fatalf("Failed to read downloaded file: %v", err)
+	}
+
+	if !bytes.Equal(downloaded, content) {
+		t.Errorf("Downloaded content mismatch: got %d bytes, want %d bytes", len(downloaded), len(content))
+	}
+
+	mu.Lock()
+	defer mu.Unlock()
+
+	// Every request covers three adjacent chunks
+	chunks := len(calculateChunks(int64(len(content)), options.ChunkSize))
+	if expected := (chunks + 2) / 3; rangeRequests != expected {
+		t.Errorf("Expected %d range requests, got %d", expected, rangeRequests)
+	}
+}
+
+func TestHTTPClient_DownloadToFile_Hasher(t *testing.T) {
+	content := bytes.Repeat([]byte("cloudget hash streaming "), 1000)
+	expected := sha256.Sum256(content)
+
+	tests := []struct {
+		name          string
+		supportsRange bool
+	}{
+		{"simple download", false},
+		{"chunked download", true},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			server := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+				if !tt.supportsRange {
+					w.Header().Set("Content-Length", fmt.Sprintf("%d", len(content)))
+					w.WriteHeader(http.StatusOK)
+					if r.Method == http.MethodGet {
+						w.Write(content)
+					}
+					return
+				}
+				http.ServeContent(w, r, "data.bin", time.Time{}, bytes.NewReader(content))
+			}))
+			defer server.Close()
+
+			client := NewHTTPClient()
+			filename := filepath.Join(t.TempDir(), "data.bin")
+
+			options := &DownloadOptions{
+				ChunkSize:      1000,
+				MaxConnections: 3,
+				Hasher:         sha256.New(),
+			}
+
+			if err := client.DownloadToFile(context.Background(), server.URL, filename, options); err != nil {
+				t.Fatalf("DownloadToFile failed: %v", err)
+			}
+
+			if got := options.Hasher.Sum(nil); !bytes.Equal(got, expected[:]) {
+				t.Errorf("Streamed hash = %x, want %x", got, expected)
+			}
+		})
+	}
+}
+
+func TestHTTPClient_DownloadToFile_Resume(t *testing.T) {
+	const chunkSize = 4096
+	content := make([]byte, 16*chunkSize)
+	for i := range content {
+		content[i] = byte(i % 251)
+	}
+
+	var mu sync.Mutex
+	rangeRequests := 0
+
+	server := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		if r.Header.Get("Range") != "" {
+			mu.Lock()
+			rangeRequests++
+			mu.Unlock()
+		}
+		http.ServeContent(w, r, "data.bin", time.Time{}, bytes.NewReader(content))
+	}))
+	defer server.Close()
+
+	tmpDir := t.TempDir()
+	filename := filepath.Join(tmpDir, "data.bin")
+	rm := NewResumeManager(filepath.Join(tmpDir, "resume"))
+
+	// Leave a full-size file behind with only the first ten chunks written
+	completedChunks := 10
+	partial := make([]byte, len(content))
+	copy(partial, content[:completedChunks*chunkSize])
+	if err := os.WriteFile(filename, partial, 0644); err != nil {
+		t.Fatalf("Failed to create partial file: %v", err)
+	}
+
+	progress := &interfaces.ResumeData{
+		URL:        server.URL,
+		FilePath:   filename,
+		TotalSize:  int64(len(content)),
+		Downloaded: int64(completedChunks * chunkSize),
+		ChunkSize:  chunkSize,
+	}
+	for i := 0; i < completedChunks; i++ {
+		progress.CompletedChunks = append(progress.CompletedChunks, i)
+	}
+	if err := rm.SaveProgress(server.URL, progress); err != nil {
+		t.Fatalf("Failed to save progress: %v", err)
+	}
+
+	client := NewHTTPClient()
+	hasher := sha256.New()
+	resumed := -1
+	options := &DownloadOptions{
+		ChunkSize:      chunkSize,
+		RangeSize:      chunkSize,
+		MaxConnections: 4,
+		RetryDelay:     10 * time.Millisecond,
+		Hasher:         hasher,
+		ResumeManager:  rm,
+		ResumeFunc: func(completed, total int) {
+			resumed = completed
+		},
+	}
+
+	if err := client.DownloadToFile(context.Background(), server.URL, filename, options); err != nil {
+		t.Fatalf("DownloadToFile failed: %v", err)
+	}
+
+	if resumed != completedChunks {
+		t.Errorf("Expected ResumeFunc to report %d kept chunks, got %d", completedChunks, resumed)
+	}
+
+	downloaded, err := os.ReadFile(filename)
+	if err != nil {
+		t.Fatalf("Failed to read downloaded file: %v", err)
+	}
+	if !bytes.Equal(downloaded, content) {
+		t.Error("Resumed download content mismatch")
+	}
+
+	if expected := sha256.Sum256(content); !bytes.Equal(hasher.Sum(nil), expected[:]) {
+		t.Error("Hash of resumed download does not cover the skipped chunks")
+	}
+
+	mu.Lock()
+	if want := 16 - completedChunks; rangeRequests != want {
+		t.Errorf("Expected %d range requests, got %d", want, rangeRequests)
+	}
+	mu.Unlock()
+
+	// Progress is cleared once the download completes
+	saved, err := rm.LoadProgress(server.URL)
+	if err != nil {
+		t.Fatalf("LoadProgress failed: %v", err)
+	}
+	if saved != nil {
+		t.Error("Resume data should be cleared after a successful download")
+	}
+}
+
+func TestHTTPClient_DownloadToFile_UnprovenPartial(t *testing.T) {
+	const chunkSize = 4096
+	content := make([]byte, 16*chunkSize+100)
+	for i := range content {
+		content[i] = byte(i % 251)
+	}
+
+	// Leftovers from another version of the file, none of which may be kept
+	stale := bytes.Repeat([]byte{0xff}, 10*chunkSize+123)
+	staleFull := make([]byte, len(content))
+	copy(staleFull, stale)
+
+	tests := []struct {
+		name string
+		// existing is what is on disk before the download starts
+		existing []byte
+		// validator, if set, is saved as progress covering the first ten chunks
+		validator string
+	}{
+		{"plain partial file without progress", stale, ""},
+		{"progress for another version of the file", staleFull, "v1"},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			var mu sync.Mutex
+			rangeRequests := 0
+
+			server := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+				if r.Header.Get("Range") != "" {
+					mu.Lock()
+					rangeRequests++
+					mu.Unlock()
+				}
+				w.Header().Set("ETag", `"v2"`)
+				http.ServeContent(w, r, "data.bin", time.Time{}, bytes.NewReader(content))
+			}))
+			defer server.Close()
+
+			tmpDir := t.TempDir()
+			filename := filepath.Join(tmpDir, "data.bin")
+			rm := NewResumeManager(filepath.Join(tmpDir, "resume"))
+
+			if err := os.WriteFile(filename, tt.existing, 0644); err != nil {
+				t.Fatalf("Failed to create partial file: %v", err)
+			}
+
+			if tt.validator != "" {
+				progress := &interfaces.ResumeData{
+					URL:        server.URL,
+					FilePath:   filename,
+					TotalSize:  int64(len(content)),
+					Downloaded: 10 * chunkSize,
+					ChunkSize:  chunkSize,
+					Validator:  tt.validator,
+				}
+				for i := 0; i < 10; i++ {
+					progress.CompletedChunks = append(progress.CompletedChunks, i)
+				}
+				if err := rm.SaveProgress(server.URL, progress); err != nil {
+					t.Fatalf("Failed to save progress: %v", err)
+				}
+			}
+
+			client := NewHTTPClient()
+			resumed := -1
+			options := &DownloadOptions{
+				ChunkSize:      chunkSize,
+				RangeSize:      chunkSize,
+				MaxConnections: 4,
+				RetryDelay:     10 * time.Millisecond,
+				ResumeManager:  rm,
+				ResumeFunc: func(completed, total int) {
+					resumed = completed
+				},
+			}
+
+			if err := client.DownloadToFile(context.Background(), server.URL, filename, options); err != nil {
+				t.Fatalf("DownloadToFile failed: %v", err)
+			}
+
+			downloaded, err := os.ReadFile(filename)
+			if err != nil {
+				t.Fatalf("Failed to read downloaded file: %v", err)
+			}
+			if !bytes.Equal(downloaded, content) {
+				t.Error("Downloaded content kept bytes from the old file")
+			}
+
+			if resumed != 0 {
+				t.Errorf("Expected ResumeFunc to report no kept chunks, got %d", resumed)
+			}
+
+			// Every chunk is fetched again
+			mu.Lock()
+			defer mu.Unlock()
+			if want := 17; rangeRequests != want {
+				t.Errorf("Expected %d range requests, got %d", want, rangeRequests)
+			}
+		})
+	}
+}
+
+type failingWriter struct {
+	limit   int
+	written int
+}
+
+func (w *failingWriter) Write(p []byte) (int, error) {
+	if w.written+len(p) > w.limit {
+		return 0, fmt.Errorf("disk full")
+	}
+	w.written += len(p)
+	return len(p), nil
+}
+
+func TestCopyPipelined(t *testing.T) {
+	content := make([]byte, pipelineDepth*simpleBufferSize*3+7)
+	for i := range content {
+		content[i] = byte(i % 251)
+	}
+
+	var dst bytes.Buffer
+	n, err := copyPipelined(&dst, bytes.NewReader(content))
+	if err != nil {
+		t.Fatalf("copyPipelined failed: %v", err)
+	}
+	if n != int64(len(content)) {
+		t.Errorf("copyPipelined copied %d bytes, want %d", n, len(content))
+	}
+	if !bytes.Equal(dst.Bytes(), content) {
+		t.Error("copyPipelined output does not match input")
+	}
+
+	// A failing write stops the copy and is reported
+	w := &failingWriter{limit: simpleBufferSize * 2}
+	if _, err := copyPipelined(w, bytes.NewReader(content)); err == nil {
+		t.Error("Expected write error, got nil")
+	}
+}
+
+func TestHTTPClient_DownloadToFile_Progress(t *testing.T) {
+	content := make([]byte, 32*1024)
+	server := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		http.ServeContent(w, r, "data.bin", time.Time{}, bytes.NewReader(content))
+	}))
+	defer server.Close()
+
+	var (
+		calls int
+		last  int64
+	)
+	options := &DownloadOptions{
+		ChunkSize:      4096,
+		MaxConnections: 4,
+		RetryDelay:     10 * time.Millisecond,
+		// Not locked: reports come from a single goroutine
+		ProgressFunc: func(downloaded, total int64) {
+			calls++
+			if downloaded < last {
+				t.Errorf("Progress went backwards: %d after %d", downloaded, last)
+			}
+			last = downloaded
+			if total != int64(len(content)) {
+				t.Errorf("Progress total = %d, want %d", total, len(content))
+			}
+		},
+	}
+
+	client := NewHTTPClient()
+	filename := filepath.Join(t.TempDir(), "data.bin")
+	if err := client.DownloadToFile(context.Background(), server.URL, filename, options); err != nil {
+		t.Fatalf("DownloadToFile failed: %v", err)
+	}
+
+	if calls == 0 {
+		t.Fatal("ProgressFunc was never called")
+	}
+	if last != int64(len(content)) {
+		t.Errorf("Final progress = %d, want %d", last, len(content))
+	}
+}
+
+func TestHTTPClient_DownloadToFile_FileInfoCache(t *testing.T) {
+	var (
+		mu           sync.Mutex
+		headRequests int
+		content      = bytes.Repeat([]byte("a"), 16*1024)
+		etag         = `"a"`
+	)
+
+	server := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		mu.Lock()
+		if r.Method == http.MethodHead {
+			headRequests++
+		}
+		current := content
+		w.Header().Set("ETag", etag)
+		mu.Unlock()
+		http.ServeContent(w, r, "data.bin", time.Time{}, bytes.NewReader(current))
+	}))
+	defer server.Close()
+
+	client := NewHTTPClient()
+	filename := filepath.Join(t.TempDir(), "data.bin")
+	options := &DownloadOptions{
+		ChunkSize:     4096,
+		RetryDelay:    10 * time.Millisecond,
+		FileInfoCache: NewFileInfoCache(t.TempDir()),
+	}
+
+	download := func() {
+		t.Helper()
+		options.Hasher = sha256.New()
+		if err := client.DownloadToFile(context.Background(), server.URL, filename, options); err != nil {
+			t.Fatalf("DownloadToFile failed: %v", err)
+		}
+		downloaded, err := os.ReadFile(filename)
+		if err != nil {
+			t.Fatalf("Failed to read downloaded file: %v", err)
+		}
+		mu.Lock()
+		defer mu.Unlock()
+		if !bytes.Equal(downloaded, content) {
+			t.Errorf("Downloaded %d bytes, want %d", len(downloaded), len(content))
+		}
+		// A retry after stale info must not hash anything from the first attempt
+		if expected := sha256.Sum256(content); !bytes.Equal(options.Hasher.Sum(nil), expected[:]) {
+			t.Error("Hash does not match the downloaded content")
+		}
+	}
+
+	download()
+	download()
+
+	mu.Lock()
+	if headRequests != 1 {
+		t.Errorf("Expected the second download to skip HEAD, got %d HEAD requests", headRequests)
+	}
+
+	// A changed file invalidates the cached info
+	content = bytes.Repeat([]byte("b"), 20*1024)
+	etag = `"b"`
+	mu.Unlock()
+
+	download()
+
+	mu.Lock()
+	if headRequests != 2 {
+		t.Errorf("Expected a fresh HEAD after the file changed, got %d HEAD requests", headRequests)
+	}
+
+	// So does a change that keeps the size, going by the ETag
+	content = bytes.Repeat([]byte("c"), 20*1024)
+	etag = `"c"`
+	mu.Unlock()
+
+	download()
+
+	mu.Lock()
+	defer mu.Unlock()
+	if headRequests != 3 {
+		t.Errorf("Expected a fresh HEAD after the ETag changed, got %d HEAD requests", headRequests)
+	}
+}
+
+func TestChunkSizeFor(t *testing.T) {
+	const mb = 1024 * 1024
+
+	tests := []struct {
+		name        string
+		totalSize   int64
+		connections int
+		expected    int64
+	}{
+		{"small file uses the minimum", 3 * mb, 8, minAutoChunkSize},
+		{"medium file splits per connection", 256 * mb, 8, 8 * mb},
+		{"large file uses the maximum", 10 * 1024 * mb, 8, maxAutoChunkSize},
+		{"rounded to the block size", 100*mb + 12345, 4, (100*mb + 12345) / 16 &^ (directIOAlignment - 1)},
+		{"no connections counts as one", 16 * mb, 0, 4 * mb},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			if result := chunkSizeFor(tt.totalSize, tt.connections); result != tt.expected {
+				t.Errorf("chunkSizeFor(%d, %d) = %d, want %d", tt.totalSize, tt.connections, result, tt.expected)
+			}
+		})
+	}
+}
+
+func TestHTTPClient_DownloadToFile_Stall(t *testing.T) {
+	content := bytes.Repeat([]byte("s"), 8*1024)
+	const piece = 1024
+
+	var mu sync.Mutex
+	gets := 0
+
+	server := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		w.Header().Set("Accept-Ranges", "bytes")
+		w.Header().Set("Content-Length", strconv.Itoa(len(content)))
+		if r.Method == http.MethodHead {
+			return
+		}
+
+		mu.Lock()
+		gets++
+		stall := gets == 1
+		mu.Unlock()
+
+		w.Header().Set("Content-Range", fmt.Sprintf("bytes 0-%d/%d", len(content)-1, len(content)))
+		w.WriteHeader(http.StatusPartialContent)
+
+		// Trickle the body out over longer than the stall timeout; the first
+		// reply also goes quiet halfway through
+		for i := 0; i < len(content); i += piece {
+			if stall && i == len(content)/2 {
+				<-r.Context().Done()
+				return
+			}
+			w.Write(content[i : i+piece])
+			w.(http.Flusher).Flush()
+			time.Sleep(40 * time.Millisecond)
+		}
+	}))
+	defer server.Close()
+
+	client := NewHTTPClient()
+	filename := filepath.Join(t.TempDir(), "data.bin")
+	options := &DownloadOptions{
+		ChunkSize:  int64(len(content)),
+		Timeout:    150 * time.Millisecond,
+		RetryDelay: 10 * time.Millisecond,
+	}
+
+	if err := client.DownloadToFile(context.Background(), server.URL, filename, options); err != nil {
+		t.Fatalf("DownloadToFile failed: %v", err)
+	}
+
+	downloaded, err := os.ReadFile(filename)
+	if err != nil {
+		t.Fatalf("Failed to read downloaded file: %v", err)
+	}
+	if !bytes.Equal(downloaded, content) {
+		t.Error("Downloaded content mismatch")
+	}
+
+	// The stalled reply is retried; the slow but steady one runs to the end
+	mu.Lock()
+	defer mu.Unlock()
+	if gets != 2 {
+		t.Errorf("Expected 2 GET requests, got %d", gets)
+	}
+}
+
+func TestHTTPClient_DownloadToFile_ResumeAutoChunkSize(t *testing.T) {
+	const chunkSize = 4096
+	content := make([]byte, 16*chunkSize)
+	for i := range content {
+		content[i] = byte(i % 251)
+	}
+
+	server := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		http.ServeContent(w, r, "data.bin", time.Time{}, bytes.NewReader(content))
+	}))
+	defer server.Close()
+
+	tmpDir := t.TempDir()
+	filename := filepath.Join(tmpDir, "data.bin")
+	rm := NewResumeManager(filepath.Join(tmpDir, "resume"))
+
+	partial := make([]byte, len(content))
+	copy(partial, content[:10*chunkSize])
+	if err := os.WriteFile(filename, partial, 0644); err != nil {
+		t.Fatalf("Failed to create partial file: %v", err)
+	}
+
+	// Progress saved with a chunk size the automatic choice would not pick
+	progress := &interfaces.ResumeData{
+		URL:        server.URL,
+		FilePath:   filename,
+		TotalSize:  int64(len(content)),
+		Downloaded: 10 * chunkSize,
+		ChunkSize:  chunkSize,
+	}
+	for i := 0; i < 10; i++ {
+		progress.CompletedChunks = append(progress.CompletedChunks, i)
+	}
+	if err := rm.SaveProgress(server.URL, progress); err != nil {
+		t.Fatalf("Failed to save progress: %v", err)
+	}
+
+	client := NewHTTPClient()
+	resumed := -1
+	options := &DownloadOptions{
+		MaxConnections: 2,
+		RetryDelay:     10 * time.Millisecond,
+		ResumeManager:  rm,
+		ResumeFunc: func(completed, total int) {
+			resumed = completed
+		},
+	}
+
+	if err := client.DownloadToFile(context.Background(), server.URL, filename, options); err != nil {
+		t.Fatalf("DownloadToFile failed: %v", err)
+	}
+
+	downloaded, err := os.ReadFile(filename)
+	if err != nil {
+		t.Fatalf("Failed to read downloaded file: %v", err)
+	}
+	if !bytes.Equal(downloaded, content) {
+		t.Error("Resumed download content mismatch")
+	}
+
+	// The saved chunk size is reused, so the saved chunks still count
+	if resumed != 10 {
+		t.Errorf("Expected ResumeFunc to report 10 kept chunks, got %d", resumed)
+	}
+}
+
+func TestRangeSizeFor(t *testing.T) {
+	const mb = 1024 * 1024
+
+	tests := []struct {
+		name        string
+		totalSize   int64
+		connections int
+		expected    int64
+	}{
+		{"small file is capped at each connection's share", 20 * mb, 8, 20 * mb / 8},
+		{"mid-size file spreads over every connection", 64 * mb, 8, 8 * mb},
+		{"uneven share rounds up", 10*mb + 1, 2, 5*mb + 1},
+		{"medium file uses the default", 256 * mb, 8, defaultRangeSize},
+		{"large file splits per connection", 768 * mb, 8, 24 * mb},
+		{"huge file uses the maximum", 100 * 1024 * mb, 8, maxAutoRangeSize},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			if result := rangeSizeFor(tt.totalSize, tt.connections); result != tt.expected {
+				t.Errorf("rangeSizeFor(%d, %d) = %d, want %d", tt.totalSize, tt.connections, result, tt.expected)
+			}
+		})
+	}
+}
+
+func TestRangeHeader(t *testing.T) {
+	tests := []struct {
+		start, end int64
+		expected   string
+	}{
+		{0, 0, "bytes=0-0"},
+		{0, 1023, "bytes=0-1023"},
+		{1 << 40, 1<<40 + 4095, "bytes=1099511627776-1099511631871"},
+	}
+
+	for _, tt := range tests {
+		if result := rangeHeader(tt.start, tt.end); result != tt.expected {
+			t.Errorf("rangeHeader(%d, %d) = %q, want %q", tt.start, tt.end, result, tt.expected)
+		}
+	}
+}
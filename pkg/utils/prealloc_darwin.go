@@ -0,0 +1,49 @@
+package utils
+
+import (
+	"errors"
+	"os"
+	"syscall"
+	"unsafe"
+)
+
+// preallocate sizes file to size bytes with its blocks reserved up front
+// through F_PREALLOCATE, asking for one contiguous run first and settling
+// for any blocks if the volume is too fragmented for that
+func preallocate(file *os.File, size int64) error {
+	info, err := file.Stat()
+	if err != nil {
+		return err
+	}
+
+	// F_PEOFPOSMODE allocates past the current end of file, so only ask for
+	// what a resumed, already sized file is missing
+	if missing := size - info.Size(); missing > 0 {
+		store := syscall.Fstore_t{
+			Flags:   syscall.F_ALLOCATECONTIG | syscall.F_ALLOCATEALL,
+			Posmode: syscall.F_PEOFPOSMODE,
+			Length:  missing,
+		}
+
+		err := fcntlPreallocate(file, &store)
+		if err != nil && !errors.Is(err, syscall.ENOSPC) {
+			store.Flags = syscall.F_ALLOCATEALL
+			err = fcntlPreallocate(file, &store)
+		}
+		if errors.Is(err, syscall.ENOSPC) {
+			return err
+		}
+	}
+
+	// F_PREALLOCATE reserves blocks without changing the file size, and
+	// filesystems without it get a sparse file
+	return file.Truncate(size)
+}
+
+func fcntlPreallocate(file *os.File, store *syscall.Fstore_t) error {
+	_, _, errno := syscall.Syscall(syscall.SYS_FCNTL, file.Fd(), syscall.F_PREALLOCATE, uintptr(unsafe.Pointer(store)))
+	if errno != 0 {
+		return errno
+	}
+	return nil
+}
@@ -0,0 +1,20 @@
+package utils
+
+import (
+	"errors"
+	"os"
+	"syscall"
+)
+
+// preallocate sizes file to size bytes with its blocks allocated up front,
+// so parallel chunk writes land in contiguous extents instead of filling
+// a sparse file block by block
+func preallocate(file *os.File, size int64) error {
+	err := syscall.Fallocate(int(file.Fd()), 0, 0, size)
+	if errors.Is(err, syscall.ENOSPC) {
+		return err
+	}
+
+	// fallocate never shrinks, and filesystems without it get a sparse file
+	return file.Truncate(size)
+}
@@ -0,0 +1,10 @@
+//go:build !linux && !darwin
+
+package utils
+
+import "os"
+
+// preallocate sizes file to size bytes
+func preallocate(file *os.File, size int64) error {
+	return file.Truncate(size)
+}
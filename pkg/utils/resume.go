@@ -2,10 +2,13 @@ package utils
 
 import (
 	"context"
+	"crypto/sha256"
+	"encoding/hex"
 	"encoding/json"
 	"fmt"
 	"os"
 	"path/filepath"
+	"sync"
 	"time"
 
 	"github.com/milindmadhukar/cloudget/pkg/interfaces"
@@ -40,11 +43,19 @@ func (rm *ResumeManager) SaveProgress(url string, progress *interfaces.ResumeDat
 		return fmt.Errorf("failed to marshal resume data: %w", err)
 	}
 
-	err = os.WriteFile(filepath, data, 0644)
+	// Write to a temporary file and rename it into place so an interrupted
+	// save never leaves a truncated resume file behind
+	tmpPath := filepath + ".tmp"
+	err = os.WriteFile(tmpPath, data, 0644)
 	if err != nil {
 		return fmt.Errorf("failed to write resume file: %w", err)
 	}
 
+	if err := os.Rename(tmpPath, filepath); err != nil {
+		os.Remove(tmpPath)
+		return fmt.Errorf("failed to write resume file: %w", err)
+	}
+
 	return nil
 }
 
@@ -156,20 +167,175 @@ func (rm *ResumeManager) CleanupOldResumeData(ctx context.Context, maxAge time.D
 
 // getResumeFilename generates a safe filename for resume data based on URL
 func (rm *ResumeManager) getResumeFilename(url string) string {
-	// Create a simple hash-like filename based on URL
-	// In a real implementation, you'd want to properly hash the URL
-	filename := ""
-	for i, r := range url {
-		if i >= 20 {
-			break
+	sum := sha256.Sum256([]byte(url))
+	return fmt.Sprintf("resume_%s.json", hex.EncodeToString(sum[:]))
+}
+
+// resumeSaveInterval is how many newly finished chunks are batched before
+// the resume data is written out again
+const resumeSaveInterval = 8
+
+// resumeTracker records which chunks of a chunked download are on disk.
+// A nil tracker is valid and tracks nothing.
+type resumeTracker struct {
+	mu      sync.Mutex
+	manager interfaces.ResumeManager
+	key     string
+	data    *interfaces.ResumeData
+	done    []bool
+	unsaved int
+}
+
+// newResumeTracker loads any saved progress for key, keeping it only if it
+// describes the same remote file, going by validator, and the same chunk
+// layout as the current download. Without such progress nothing already on
+// disk is trusted, since it may belong to another version of the file.
+func newResumeTracker(manager interfaces.ResumeManager, key, filePath, validator string, totalSize, chunkSize int64, numChunks int) *resumeTracker {
+	t := &resumeTracker{
+		manager: manager,
+		key:     key,
+		done:    make([]bool, numChunks),
+		data: &interfaces.ResumeData{
+			URL:       key,
+			FilePath:  filePath,
+			TotalSize: totalSize,
+			ChunkSize: chunkSize,
+			Validator: validator,
+		},
+	}
+
+	saved, err := manager.LoadProgress(key)
+	if err != nil || saved == nil {
+		return t
+	}
+
+	if saved.FilePath != filePath || saved.TotalSize != totalSize ||
+		saved.ChunkSize != chunkSize || saved.Validator != validator {
+		return t
+	}
+
+	info, err := os.Stat(filePath)
+	if err != nil {
+		return t
+	}
+
+	for _, i := range saved.CompletedChunks {
+		if i < 0 || i >= numChunks || t.done[i] {
+			continue
 		}
-		if (r >= 'a' && r <= 'z') || (r >= 'A' && r <= 'Z') || (r >= '0' && r <= '9') {
-			filename += string(r)
-		} else {
-			filename += "_"
+
+		// A file cut short since only still holds the chunks that end within it
+		start := int64(i) * chunkSize
+		end := start + chunkSize
+		if end > totalSize {
+			end = totalSize
 		}
+		if end > info.Size() {
+			continue
+		}
+
+		t.done[i] = true
+		t.data.CompletedChunks = append(t.data.CompletedChunks, i)
+		t.data.Downloaded += end - start
+	}
+	t.data.Hash = saved.Hash
+
+	return t
+}
+
+// savedChunkSize returns the chunk size of the saved progress for a
+// download of fileInfo to filePath, or 0 if there is none. An automatic
+// chunk size depends on the connection count, so reusing the saved one
+// keeps the progress valid when the count changes between attempts.
+func savedChunkSize(urlStr, filePath string, fileInfo *FileInfo, options *DownloadOptions) int64 {
+	if options == nil || options.ResumeManager == nil {
+		return 0
+	}
+
+	saved, err := options.ResumeManager.LoadProgress(resumeKey(urlStr, options))
+	if err != nil || saved == nil {
+		return 0
+	}
+
+	if saved.FilePath != filePath || saved.TotalSize != fileInfo.Size || saved.Validator != fileInfo.validator() {
+		return 0
+	}
+
+	return saved.ChunkSize
+}
+
+// completedCount returns how many chunks are already on disk
+func (t *resumeTracker) completedCount() int {
+	if t == nil {
+		return 0
+	}
+	t.mu.Lock()
+	defer t.mu.Unlock()
+	return len(t.data.CompletedChunks)
+}
+
+// isCompleted reports whether chunk i is already on disk
+func (t *resumeTracker) isCompleted(i int) bool {
+	if t == nil {
+		return false
+	}
+	t.mu.Lock()
+	defer t.mu.Unlock()
+	return t.done[i]
+}
+
+// markCompleted records chunk i as written, saving every resumeSaveInterval chunks
+func (t *resumeTracker) markCompleted(file *os.File, i int, size int64) error {
+	if t == nil {
+		return nil
+	}
+	t.mu.Lock()
+	defer t.mu.Unlock()
+
+	if t.done[i] {
+		return nil
+	}
+	t.done[i] = true
+	t.data.CompletedChunks = append(t.data.CompletedChunks, i)
+	t.data.Downloaded += size
+	t.unsaved++
+
+	if t.unsaved < resumeSaveInterval {
+		return nil
+	}
+	return t.saveLocked(file)
+}
+
+// save writes the current progress out
+func (t *resumeTracker) save(file *os.File) error {
+	if t == nil {
+		return nil
+	}
+	t.mu.Lock()
+	defer t.mu.Unlock()
+	return t.saveLocked(file)
+}
+
+func (t *resumeTracker) saveLocked(file *os.File) error {
+	// Flush the chunk data before claiming it in the resume file
+	if err := file.Sync(); err != nil {
+		return fmt.Errorf("failed to sync file: %w", err)
+	}
+
+	t.data.LastModified = time.Now()
+	if err := t.manager.SaveProgress(t.key, t.data); err != nil {
+		return err
+	}
+	t.unsaved = 0
+	return nil
+}
+
+// clear removes the saved progress once the download has finished
+func (t *resumeTracker) clear() error {
+	if t == nil {
+		return nil
 	}
-	return fmt.Sprintf("resume_%s.json", filename)
+	return t.manager.ClearProgress(t.key)
 }
 
 func min(a, b int) int {
@@ -0,0 +1,150 @@
+package utils
+
+import (
+	"context"
+	"io"
+	"sync/atomic"
+	"time"
+)
+
+// tunerState tracks how far the connection tuner has got in its search
+type tunerState int
+
+const (
+	// tunerStep adds a connection each interval while throughput keeps improving
+	tunerStep tunerState = iota
+	// tunerAccept checks that throughput holds after backing off a step
+	tunerAccept
+	// tunerFinished means the connection count is settled
+	tunerFinished
+)
+
+const (
+	// tunerInterval is how long throughput is measured between adjustments
+	tunerInterval = 2 * time.Second
+	// tunerMaxConnections is the ceiling the tuner will not step past
+	tunerMaxConnections = 32
+	// tunerImprovement is the speedup an extra connection has to bring
+	tunerImprovement = 1.05
+)
+
+// connectionTuner searches for the number of connections that maximises
+// throughput, stepping up one connection at a time until it stops paying off
+type connectionTuner struct {
+	state       tunerState
+	connections int
+	ceiling     int
+	bestSpeed   float64
+}
+
+func newConnectionTuner(connections int) *connectionTuner {
+	ceiling := tunerMaxConnections
+	if connections > ceiling {
+		ceiling = connections
+	}
+	if connections < 1 {
+		connections = 1
+	}
+
+	return &connectionTuner{
+		state:       tunerStep,
+		connections: connections,
+		ceiling:     ceiling,
+	}
+}
+
+// observe records the throughput (bytes/sec) measured with the current
+// connection count and returns the count to use for the next interval.
+// An interval in which nothing arrived is ignored: it says more about the
+// server getting started than about the connection count.
+func (t *connectionTuner) observe(speed float64) int {
+	if speed <= 0 {
+		return t.connections
+	}
+
+	switch t.state {
+	case tunerStep:
+		if speed >= t.bestSpeed*tunerImprovement {
+			t.bestSpeed = speed
+			if t.connections < t.ceiling {
+				t.connections++
+			} else {
+				t.state = tunerFinished
+			}
+			return t.connections
+		}
+
+		// The last connection added did not pay for itself
+		if t.connections > 1 {
+			t.connections--
+		}
+		t.state = tunerAccept
+
+	case tunerAccept:
+		// Keep backing off while throughput is clearly below the best seen
+		if speed*tunerImprovement < t.bestSpeed && t.connections > 1 {
+			t.connections--
+			return t.connections
+		}
+		t.state = tunerFinished
+	}
+
+	return t.connections
+}
+
+// tuneConnections measures download throughput every tunerInterval from
+// transferred, the count of bytes received so far, and starts or retires
+// workers as the tuner decides, until the tuner settles, ctx ends or
+// dispatched is closed. It returns the final worker count.
+func tuneConnections(ctx context.Context, dispatched <-chan struct{}, transferred *int64, workers int, startWorker func(), retire chan<- struct{}) int {
+	tuner := newConnectionTuner(workers)
+
+	ticker := time.NewTicker(tunerInterval)
+	defer ticker.Stop()
+
+	lastBytes := atomic.LoadInt64(transferred)
+	lastTime := time.Now()
+
+	for tuner.state != tunerFinished {
+		select {
+		case <-ctx.Done():
+			return workers
+		case <-dispatched:
+			return workers
+		case now := <-ticker.C:
+			current := atomic.LoadInt64(transferred)
+			speed := float64(current-lastBytes) / now.Sub(lastTime).Seconds()
+			lastBytes, lastTime = current, now
+
+			next := tuner.observe(speed)
+			for ; workers < next; workers++ {
+				startWorker()
+			}
+			for ; workers > next; workers-- {
+				// Workers may all have exited already; never wait on them
+				select {
+				case retire <- struct{}{}:
+				case <-ctx.Done():
+					return workers
+				case <-dispatched:
+					return workers
+				}
+			}
+		}
+	}
+
+	return workers
+}
+
+// countingReader adds the number of bytes read through it to n, so
+// throughput can be measured while a chunk is still arriving
+type countingReader struct {
+	r io.Reader
+	n *int64
+}
+
+func (c *countingReader) Read(p []byte) (int, error) {
+	n, err := c.r.Read(p)
+	atomic.AddInt64(c.n, int64(n))
+	return n, err
+}
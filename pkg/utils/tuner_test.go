@@ -0,0 +1,93 @@
+package utils
+
+import "testing"
+
+func TestConnectionTuner_StepsWhileImproving(t *testing.T) {
+	tuner := newConnectionTuner(4)
+
+	// Throughput keeps improving by more than 5%, so keep adding connections
+	speeds := []float64{100, 120, 140}
+	want := []int{5, 6, 7}
+	for i, speed := range speeds {
+		if got := tuner.observe(speed); got != want[i] {
+			t.Errorf("observe(%v) = %d, want %d", speed, got, want[i])
+		}
+	}
+
+	// A flat measurement backs off the last step
+	if got := tuner.observe(141); got != 6 {
+		t.Errorf("observe after plateau = %d, want 6", got)
+	}
+	if tuner.state != tunerAccept {
+		t.Errorf("state = %v, want tunerAccept", tuner.state)
+	}
+
+	// Throughput holds, so the tuner settles
+	if got := tuner.observe(139); got != 6 {
+		t.Errorf("observe in accept = %d, want 6", got)
+	}
+	if tuner.state != tunerFinished {
+		t.Errorf("state = %v, want tunerFinished", tuner.state)
+	}
+
+	// Once finished the count no longer changes
+	if got := tuner.observe(1000); got != 6 {
+		t.Errorf("observe after finish = %d, want 6", got)
+	}
+}
+
+func TestConnectionTuner_BacksOffWhenSlower(t *testing.T) {
+	tuner := newConnectionTuner(2)
+
+	tuner.observe(100) // 3 connections
+	if got := tuner.observe(80); got != 2 {
+		t.Errorf("observe after slowdown = %d, want 2", got)
+	}
+
+	// Still clearly below the best speed seen, drop another connection
+	if got := tuner.observe(60); got != 1 {
+		t.Errorf("observe while still slower = %d, want 1", got)
+	}
+
+	// Never drops below one connection
+	if got := tuner.observe(10); got != 1 {
+		t.Errorf("observe at minimum = %d, want 1", got)
+	}
+}
+
+func TestConnectionTuner_Ceiling(t *testing.T) {
+	tuner := newConnectionTuner(tunerMaxConnections - 1)
+
+	if got := tuner.observe(100); got != tunerMaxConnections {
+		t.Errorf("observe = %d, want %d", got, tunerMaxConnections)
+	}
+	if got := tuner.observe(200); got != tunerMaxConnections {
+		t.Errorf("observe at ceiling = %d, want %d", got, tunerMaxConnections)
+	}
+	if tuner.state != tunerFinished {
+		t.Errorf("state = %v, want tunerFinished", tuner.state)
+	}
+}
+
+func TestConnectionTuner_IgnoresEmptySamples(t *testing.T) {
+	tuner := newConnectionTuner(4)
+
+	// Nothing has arrived yet, which is no reason to add connections
+	for i := 0; i < 3; i++ {
+		if got := tuner.observe(0); got != 4 {
+			t.Errorf("observe(0) = %d, want 4", got)
+		}
+	}
+
+	if got := tuner.observe(100); got != 5 {
+		t.Errorf("observe(100) = %d, want 5", got)
+	}
+
+	// A quiet interval mid-search neither counts as a slowdown nor resets it
+	if got := tuner.observe(0); got != 5 {
+		t.Errorf("observe(0) while stepping = %d, want 5", got)
+	}
+	if tuner.state != tunerStep || tuner.bestSpeed != 100 {
+		t.Errorf("state = %v, bestSpeed = %v, want tunerStep, 100", tuner.state, tuner.bestSpeed)
+	}
+}